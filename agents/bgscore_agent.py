@@ -125,13 +125,17 @@ async def create_and_compose(prompt: str, file_name: str):
         return {"status": "error", "error_message": str(e)}
         
 
-bgscore_agent = LlmAgent(
-    model= BackgroundScoreConfig.MODEL,
-    name=BackgroundScoreConfig.AGENT_NAME,
-    description=BackgroundScoreConfig.DESCRIPTION,
-    instruction= prompt.BGSCORE_PROMPT,
-    tools=[create_and_compose], # Include the AgentTool
-    output_key="background_music"
-)
+def create_bgscore_agent(name: str = BackgroundScoreConfig.AGENT_NAME) -> LlmAgent:
+    """Builds an LLM agent that turns the script's music cues into a Beatoven track."""
+    return LlmAgent(
+        model= BackgroundScoreConfig.MODEL,
+        name=name,
+        description=BackgroundScoreConfig.DESCRIPTION,
+        instruction= prompt.BGSCORE_PROMPT,
+        tools=[create_and_compose], # Include the AgentTool
+        output_key="background_music"
+    )
+
+bgscore_agent = create_bgscore_agent()
 
 print(f"✅ Agent '{bgscore_agent.name}' created using model '{bgscore_agent.model}'.")
\ No newline at end of file
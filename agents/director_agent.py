@@ -2,27 +2,55 @@
 This agent coordinates the entire video generation process by calling other agents in sequence.
 It uses the Google ADK to manage the agents and their interactions.
 """
+from typing import Optional
+
 from config.config import DirectorConfig
 from google.adk.agents import SequentialAgent
 
-from agents.script_writer_agent import script_writer_agent
-from agents.image_producer_agent import image_producer_agent 
-from agents.dubbing_agent import dubbing_agent
-from agents.bgscore_agent import bgscore_agent
-from agents.video_builder_agent import video_builder_agent
+from agents.script_writer_agent import create_script_writer_agent
+from agents.image_producer_agent import create_image_producer_agent
+from agents.dubbing_agent import create_dubbing_agent
+from agents.bgscore_agent import create_bgscore_agent
+from agents.video_builder_agent import create_video_builder_agent
+from agents.fast_path_agents import create_fast_path_stage_agents
+from agents.speculative_bgscore import SpeculativeBackgroundScoreAgent, SpeculativeScore
+
+def create_director_agent(fast_path: bool = False, speculation: Optional[SpeculativeScore] = None) -> SequentialAgent:
+    """
+    Creates a director agent with fresh sub agents.
+    Args:
+        fast_path: Only the script writer uses an LLM, the remaining stages call their tools
+            directly and fall back to their LLM agents if the script can't be parsed.
+        speculation: A background score composition started from the user prompt. The
+            background score stage keeps it or recomposes from the script's music cues.
+    """
+    if fast_path:
+        image_stage, dubbing_stage, bgscore_stage, video_stage = create_fast_path_stage_agents()
+    else:
+        image_stage = create_image_producer_agent()
+        dubbing_stage = create_dubbing_agent()
+        bgscore_stage = create_bgscore_agent()
+        video_stage = create_video_builder_agent()
+    if speculation is not None:
+        bgscore_stage = SpeculativeBackgroundScoreAgent(speculation=speculation, composer_agent=bgscore_stage)
+
+    return SequentialAgent(
+        name=DirectorConfig.FAST_PATH_AGENT_NAME if fast_path else DirectorConfig.AGENT_NAME,
+        description=DirectorConfig.FAST_PATH_DESCRIPTION if fast_path else DirectorConfig.DESCRIPTION,
+        sub_agents=[
+            create_script_writer_agent(),
+            image_stage,
+            dubbing_stage,
+            bgscore_stage,
+            video_stage,
+        ]
+    )
 
 # Sequential agent to coordinate the entire video generation process
 # This agent will call other agents in sequence to generate the video
-director_agent = SequentialAgent(
-    name=DirectorConfig.AGENT_NAME,
-    description=DirectorConfig.DESCRIPTION,
-    sub_agents=[
-        script_writer_agent,
-        image_producer_agent,
-        dubbing_agent,
-        bgscore_agent,
-        video_builder_agent
-    ]    
-)
+director_agent = create_director_agent()
 root_agent = director_agent
-print(f"✅ Agent '{director_agent.name}'")
\ No newline at end of file
+print(f"✅ Agent '{director_agent.name}'")
+
+fast_path_director_agent = create_director_agent(fast_path=True)
+print(f"✅ Agent '{fast_path_director_agent.name}'")
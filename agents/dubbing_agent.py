@@ -5,6 +5,7 @@ from google.adk.agents import LlmAgent
 from openai import OpenAI
 
 from . import prompt
+from .quality import get_quality_tier
 from config.config import DubbingArtistConfig
 
 # Ensure the output folder exists
@@ -23,12 +24,17 @@ def generate_tts(prompt: str, file_name: str, instruction: str) -> dict:
         audio file path.
     """
     try:
+        tts_model = get_quality_tier().tts_model
+        options = {}
+        if not tts_model.startswith("tts-1"):
+            # tts-1 and tts-1-hd don't support voice instructions
+            options["instructions"] = instruction
         client = OpenAI()
         with client.audio.speech.with_streaming_response.create(
-            model=DubbingArtistConfig.OPENAI_MODEL,
+            model=tts_model,
             voice=DubbingArtistConfig.VOICE,
             input=prompt,
-            instructions=instruction,
+            **options,
         ) as response:
             response.stream_to_file(file_name)
         # it will create mp3 file as default
@@ -38,13 +44,17 @@ def generate_tts(prompt: str, file_name: str, instruction: str) -> dict:
         return {"status": "error", "error_message": str(e)}
         
 
-dubbing_agent = LlmAgent(
-    model= DubbingArtistConfig.MODEL,
-    name=DubbingArtistConfig.AGENT_NAME,
-    description=DubbingArtistConfig.DESCRIPTION,
-    instruction= prompt.DUBBING_PROMPT,
-    tools=[generate_tts], # Include the AgentTool
-    output_key="dubbing_file",  # Key to store the generated audio file
-)
+def create_dubbing_agent(name: str = DubbingArtistConfig.AGENT_NAME) -> LlmAgent:
+    """Builds an LLM agent that narrates the script with `generate_tts`."""
+    return LlmAgent(
+        model= DubbingArtistConfig.MODEL,
+        name=name,
+        description=DubbingArtistConfig.DESCRIPTION,
+        instruction= prompt.DUBBING_PROMPT,
+        tools=[generate_tts], # Include the AgentTool
+        output_key="dubbing_file",  # Key to store the generated audio file
+    )
+
+dubbing_agent = create_dubbing_agent()
 
 print(f"✅ Agent '{dubbing_agent.name}' created using model '{dubbing_agent.model}'.")
\ No newline at end of file
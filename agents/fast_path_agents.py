@@ -0,0 +1,208 @@
+"""Deterministic fast-path agents for the tool stages of the pipeline.
+Each stage parses the video script written by the script writer agent and
+calls its tool directly, avoiding an LLM turn per stage. If the script cannot
+be parsed, the stage falls back to the regular LLM agent for that stage.
+"""
+import abc
+import asyncio
+import json
+import os
+import wave
+from pathlib import Path
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from typing_extensions import override
+
+from config.config import (
+    BackgroundScoreConfig,
+    DubbingArtistConfig,
+    ImageProducerConfig,
+    VideoBuilderConfig,
+)
+from .bgscore_agent import create_and_compose, create_bgscore_agent
+from .dubbing_agent import create_dubbing_agent, generate_tts
+from .image_producer_agent import create_image_producer_agent, generate_image
+from .script_parser import ScriptParseError, ScriptSegment, parse_video_script, segment_file_stem
+from .script_writer_agent import save_script_to_file
+from .video_builder_agent import create_video, create_video_builder_agent
+
+IMAGE_FOLDER = os.path.join(ImageProducerConfig.output_dir, "images")
+DUBBING_FILE = os.path.join(DubbingArtistConfig.output_dir, "dubbing.mp3")
+BACKGROUND_MUSIC_FILE = os.path.join(BackgroundScoreConfig.output_dir, "background_music.mp3")
+DEFAULT_MUSIC_CUE = "Calm, pleasant and unobtrusive background music"
+
+
+def read_video_script(ctx: InvocationContext) -> str:
+    """
+    Returns the video script of the current job. The script writer either replies
+    with the script or only reports that it saved it, so the scripts passed to
+    `save_script_to_file` in this invocation are tried first, then the reply.
+    The first candidate that parses is returned, otherwise the reply as is.
+    """
+    saved_scripts = [
+        call.args.get("script", "")
+        for event in reversed(ctx.session.events)
+        if event.invocation_id == ctx.invocation_id
+        for call in event.get_function_calls()
+        if call.name == save_script_to_file.__name__ and call.args
+    ]
+    reply = ctx.session.state.get("video_script", "") or ""
+    reply = reply if isinstance(reply, str) else ""
+    for script in [*saved_scripts, reply]:
+        try:
+            parse_video_script(script)
+        except ScriptParseError:
+            continue
+        return script
+    return reply
+
+
+class ToolStageAgent(BaseAgent):
+    """
+    Base class for a pipeline stage that calls its tool directly from the parsed script.
+    Subclasses implement `run_stage`; raising ScriptParseError from it (or failing to
+    parse the script) delegates the stage to `fallback_agent`.
+    """
+    fallback_agent: LlmAgent
+    output_key: str
+
+    def __init__(self, name: str, description: str, fallback_agent: LlmAgent, output_key: str):
+        super().__init__(
+            name=name,
+            description=description,
+            fallback_agent=fallback_agent,
+            output_key=output_key,
+            sub_agents=[fallback_agent],
+        )
+
+    @abc.abstractmethod
+    async def run_stage(self, segments: list[ScriptSegment]) -> dict:
+        """Runs the stage's tool for the parsed script and returns its result."""
+
+    @override
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        try:
+            segments = parse_video_script(read_video_script(ctx))
+            result = await self.run_stage(segments)
+        except ScriptParseError as e:
+            print(f"⚠️ {self.name}: {e}. Falling back to '{self.fallback_agent.name}'.")
+            async for event in self.fallback_agent.run_async(ctx):
+                yield event
+            return
+
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=json.dumps(result))]),
+            actions=EventActions(state_delta={self.output_key: result}),
+        )
+
+
+class ImageProducerFastAgent(ToolStageAgent):
+    """Generates one image per script segment, several requests at a time."""
+
+    async def run_stage(self, segments: list[ScriptSegment]) -> dict:
+        Path(IMAGE_FOLDER).mkdir(parents=True, exist_ok=True)
+        semaphore = asyncio.Semaphore(ImageProducerConfig.IMAGE_CONCURRENCY)
+
+        async def produce(segment: ScriptSegment) -> dict:
+            file_name = os.path.join(IMAGE_FOLDER, f"{segment_file_stem(segment)}.png")
+            async with semaphore:
+                return await asyncio.to_thread(generate_image, segment.visual, file_name)
+
+        results = await asyncio.gather(*(produce(segment) for segment in segments))
+        failed = [r for r in results if r.get("status") != "success"]
+        return {"status": "error" if failed else "success", "images": results}
+
+
+class DubbingFastAgent(ToolStageAgent):
+    """Narrates all Narrator lines of the script into a single audio file."""
+
+    async def run_stage(self, segments: list[ScriptSegment]) -> dict:
+        narration = " ".join(s.narrator for s in segments if s.narrator)
+        if not narration:
+            # A music-only script; the LLM dubbing agent would have nothing to narrate either.
+            # The video builder still needs a voice over track, so write silence.
+            await asyncio.to_thread(write_silence, DUBBING_FILE, segments[-1].end)
+            return {"status": "success", "file": DUBBING_FILE, "message": "Video script has no Narrator lines"}
+        return await asyncio.to_thread(
+            generate_tts, narration, DUBBING_FILE, DubbingArtistConfig.TTS_INSTRUCTION
+        )
+
+
+class BackgroundScoreFastAgent(ToolStageAgent):
+    """Composes one background track from the script's Background Music cues."""
+
+    async def run_stage(self, segments: list[ScriptSegment]) -> dict:
+        return await create_and_compose(music_prompt(segments), BACKGROUND_MUSIC_FILE)
+
+
+class VideoBuilderFastAgent(ToolStageAgent):
+    """Assembles the final video from the generated assets."""
+
+    async def run_stage(self, segments: list[ScriptSegment]) -> dict:
+        result = await asyncio.to_thread(
+            create_video,
+            VideoBuilderConfig.output_dir,
+            IMAGE_FOLDER,
+            DUBBING_FILE,
+            BACKGROUND_MUSIC_FILE,
+            segments[-1].end,
+        )
+        return result or {"status": "error", "error_message": "Video could not be created"}
+
+
+def write_silence(file_name: str, seconds: int, rate: int = 44100) -> None:
+    """Writes a silent audio track (WAV data, which ffmpeg reads whatever the extension)."""
+    Path(file_name).parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(file_name, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\x00\x00" * rate * seconds)
+
+
+def music_prompt(segments: list[ScriptSegment]) -> str:
+    """
+    Builds a Beatoven prompt from the script's Background Music cues.
+    Args:
+        segments: Parsed script segments.
+    """
+    cues = list(dict.fromkeys(s.background_music.rstrip(" .!;,") for s in segments if s.background_music))
+    cue_text = "; ".join(cue for cue in cues if cue) or DEFAULT_MUSIC_CUE
+    return f"{cue_text}. {segments[-1].end} seconds long."
+
+
+def create_fast_path_stage_agents() -> list[BaseAgent]:
+    """Creates the fast-path agents for every stage after the script writer."""
+    return [
+        ImageProducerFastAgent(
+            name=ImageProducerConfig.AGENT_NAME,
+            description=ImageProducerConfig.DESCRIPTION,
+            fallback_agent=create_image_producer_agent(f"{ImageProducerConfig.AGENT_NAME}_llm"),
+            output_key="image_info",
+        ),
+        DubbingFastAgent(
+            name=DubbingArtistConfig.AGENT_NAME,
+            description=DubbingArtistConfig.DESCRIPTION,
+            fallback_agent=create_dubbing_agent(f"{DubbingArtistConfig.AGENT_NAME}_llm"),
+            output_key="dubbing_file",
+        ),
+        BackgroundScoreFastAgent(
+            name=BackgroundScoreConfig.AGENT_NAME,
+            description=BackgroundScoreConfig.DESCRIPTION,
+            fallback_agent=create_bgscore_agent(f"{BackgroundScoreConfig.AGENT_NAME}_llm"),
+            output_key="background_music",
+        ),
+        VideoBuilderFastAgent(
+            name=VideoBuilderConfig.AGENT_NAME,
+            description=VideoBuilderConfig.DESCRIPTION,
+            fallback_agent=create_video_builder_agent(f"{VideoBuilderConfig.AGENT_NAME}_llm"),
+            output_key="video_info",
+        ),
+    ]
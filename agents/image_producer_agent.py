@@ -7,6 +7,7 @@ from openai import OpenAI
 import base64
 
 from . import prompt
+from .quality import get_quality_tier
 from config.config import ImageProducerConfig
 
 # Ensure the output folder exists
@@ -25,6 +26,7 @@ def generate_image(prompt: str, file_name: str) -> dict:
         or an error message.
     """
     try:
+        tier = get_quality_tier()
         client = OpenAI()
         # response = client.images.generate(
         #     model="dall-e-2",  # Or "dall-e-3" if you have access and prefer it
@@ -36,8 +38,8 @@ def generate_image(prompt: str, file_name: str) -> dict:
         response = client.images.generate(
             model=ImageProducerConfig.OPENAI_MODEL,
             prompt=prompt,
-            size=ImageProducerConfig.IMAGE_SIZE,
-            quality=ImageProducerConfig.IMAGE_QUALITY,  # Choose a supported quality (low, medium, high)
+            size=tier.image_size,
+            quality=tier.image_quality,  # Choose a supported quality (low, medium, high)
             n=ImageProducerConfig.IMAGE_COUNT  # Number of images to generate
         )
         image_data_b64 = response.data[0].b64_json
@@ -53,13 +55,17 @@ def generate_image(prompt: str, file_name: str) -> dict:
         return {"status": "error", "error_message": str(e)}
         
 
-image_producer_agent = LlmAgent(
-    model=ImageProducerConfig.MODEL,
-    name=ImageProducerConfig.AGENT_NAME,
-    description=ImageProducerConfig.DESCRIPTION,
-    instruction= prompt.IMAGE_PRODUCER_PROMPT,
-    tools=[generate_image], # Include the AgentTool
-    output_key="image_info",  # Key to store the generated image info
-)
+def create_image_producer_agent(name: str = ImageProducerConfig.AGENT_NAME) -> LlmAgent:
+    """Builds an LLM agent that generates one image per Visual cue of the script."""
+    return LlmAgent(
+        model=ImageProducerConfig.MODEL,
+        name=name,
+        description=ImageProducerConfig.DESCRIPTION,
+        instruction= prompt.IMAGE_PRODUCER_PROMPT,
+        tools=[generate_image], # Include the AgentTool
+        output_key="image_info",  # Key to store the generated image info
+    )
+
+image_producer_agent = create_image_producer_agent()
 
 print(f"✅ Agent '{image_producer_agent.name}' created using model '{image_producer_agent.model}'.")
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""Persistent cache for LLM responses.
+The cache is installed as before/after model callbacks on every LlmAgent of an
+agent tree. Requests are keyed on the model name, the rendered system
+instruction (which includes state such as {video_script}), the conversation
+contents and the declared tools. A cached response replays the model's text
+and tool-call decisions, so a fully cached run makes no model calls.
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+from config.config import LLMCacheConfig
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Converts pydantic models (genai types) to plain JSON data."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    return value
+
+
+def _strip_call_ids(value: Any) -> Any:
+    """
+    Removes the per-run ids ADK assigns to function calls and responses,
+    which would otherwise make every follow-up request a cache miss.
+    """
+    if isinstance(value, dict):
+        return {
+            k: _strip_call_ids(v)
+            for k, v in value.items()
+            if not (k == "id" and ("name" in value))
+        }
+    if isinstance(value, list):
+        return [_strip_call_ids(v) for v in value]
+    return value
+
+
+def request_cache_key(llm_request: LlmRequest) -> str:
+    """
+    Computes the cache key of an LLM request.
+    Args:
+        llm_request: The request about to be sent to the model.
+    Returns:
+        A hex digest identifying the request.
+    """
+    config = llm_request.config
+    payload = {
+        "model": llm_request.model,
+        "system_instruction": _to_jsonable(config.system_instruction) if config else None,
+        "tools": _to_jsonable(config.tools) if config and config.tools else None,
+        "contents": _strip_call_ids(_to_jsonable(llm_request.contents)),
+    }
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    On-disk LLM response cache with TTL and size-based (least recently used) eviction.
+    Each entry is a JSON file named after its request key. A file's mtime is its
+    creation time (used for the TTL) and its atime is its last use (used for eviction).
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = LLMCacheConfig.CACHE_DIR,
+        ttl_seconds: int = LLMCacheConfig.TTL_SECONDS,
+        max_size_bytes: int = LLMCacheConfig.MAX_SIZE_BYTES,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self.hits = 0
+        self.misses = 0
+        # Key and model of the request in flight, per (invocation, agent), for after_model_callback
+        self._pending: dict[tuple[str, str], tuple[str, str]] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _expired(self, stat: os.stat_result, now: float) -> bool:
+        return now - stat.st_mtime > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[dict]:
+        """Returns the cache entry for `key`, or None if missing or expired."""
+        path = self._path(key)
+        now = time.time()
+        try:
+            stat = path.stat()
+            if self._expired(stat, now):
+                path.unlink(missing_ok=True)
+                return None
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            # Mark as recently used for eviction, keeping the creation time
+            os.utime(path, (now, stat.st_mtime))
+        except (OSError, ValueError):
+            # Missing, unreadable, or evicted by another process meanwhile
+            return None
+        return entry
+
+    def put(self, key: str, model: str, llm_response: LlmResponse) -> None:
+        """Stores a model response and the tool calls it decided on."""
+        response = _strip_call_ids(_to_jsonable(llm_response))
+        tool_calls = [
+            {"name": part.function_call.name, "args": part.function_call.args}
+            for part in (llm_response.content.parts or [])
+            if part.function_call
+        ]
+        entry = {
+            "key": key,
+            "model": model,
+            "created_at": time.time(),
+            "tool_calls": tool_calls,
+            "response": response,
+        }
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.utime(tmp_path, (entry["created_at"], entry["created_at"]))
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes expired entries, then least recently used entries above the size limit."""
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self._expired(stat, now):
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+    def before_model_callback(
+        self, callback_context: CallbackContext, llm_request: LlmRequest
+    ) -> Optional[LlmResponse]:
+        """Returns the cached response for the request, skipping the model call on a hit."""
+        key = request_cache_key(llm_request)
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            print(f"💾 LLM cache hit for '{callback_context.agent_name}' ({key[:12]})")
+            return LlmResponse.model_validate(entry["response"])
+        self.misses += 1
+        self._pending[(callback_context.invocation_id, callback_context.agent_name)] = (
+            key,
+            llm_request.model or "",
+        )
+        return None
+
+    def after_model_callback(
+        self, callback_context: CallbackContext, llm_response: LlmResponse
+    ) -> Optional[LlmResponse]:
+        """Stores complete, successful model responses."""
+        pending_id = (callback_context.invocation_id, callback_context.agent_name)
+        if llm_response.partial:
+            return None
+        pending = self._pending.pop(pending_id, None)
+        if pending is None or llm_response.error_code or not llm_response.content:
+            return None
+        key, model = pending
+        try:
+            self.put(key, model, llm_response)
+        except OSError as e:
+            print(f"Could not write LLM cache entry: {e}")
+        return None
+
+
+def install_llm_cache(agent: BaseAgent, cache: LLMResponseCache) -> None:
+    """
+    Installs the cache on `agent` and every LlmAgent below it.
+    Args:
+        agent: Root of the agent tree.
+        cache: The cache to use.
+    """
+    if isinstance(agent, LlmAgent):
+        agent.before_model_callback = cache.before_model_callback
+        agent.after_model_callback = cache.after_model_callback
+    for sub_agent in agent.sub_agents:
+        install_llm_cache(sub_agent, cache)
@@ -0,0 +1,177 @@
+"""Parallel chunked renderer.
+The timeline is split at image segment boundaries into one chunk per worker.
+Each chunk is rendered and encoded by a separate process with the streaming
+frame source, then the chunks are joined with ffmpeg's concat demuxer without
+re-encoding and the audio track is muxed in.
+
+Segment boundaries fall on whole seconds, so every chunk holds a whole number
+of frames and starts on a keyframe. Transitions are fade-ins at the start of a
+segment, so no transition overlaps a chunk boundary. Keyframes forced for HLS
+are offset by each chunk's start so they fall on the final video's segment grid.
+"""
+import multiprocessing
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from moviepy.config import get_setting
+from moviepy.video.VideoClip import VideoClip
+
+from .stream_packager import keyframe_params
+from .streaming_renderer import SegmentFrameSource, canvas_size, fit_size
+
+
+def plan_chunks(
+    segments: list[tuple[str, float]], video_duration: float, workers: int
+) -> list[tuple[list[tuple[str, float]], float]]:
+    """
+    Groups consecutive segments into chunks of roughly equal duration.
+    Args:
+        segments: (image path, duration) for each segment, in order.
+        video_duration: Duration of the video in seconds.
+        workers: Number of chunks to aim for.
+    Returns:
+        A list of (segments, chunk duration). Segments past `video_duration` are
+        dropped and the last chunk is padded with black up to `video_duration`.
+    """
+    trimmed = []
+    current_time = 0.0
+    for path, duration in segments:
+        if current_time >= video_duration:
+            break
+        duration = min(duration, video_duration - current_time)
+        trimmed.append((path, duration))
+        current_time += duration
+
+    # Split the image content evenly; black padding at the end is cheap to encode
+    target = current_time / max(1, min(workers, len(trimmed) or 1))
+    chunks: list[tuple[list[tuple[str, float]], float]] = []
+    chunk: list[tuple[str, float]] = []
+    chunk_duration = 0.0
+    elapsed = 0.0
+    for path, duration in trimmed:
+        chunk.append((path, duration))
+        chunk_duration += duration
+        elapsed += duration
+        # Cut at the first segment boundary past the next evenly spaced split point
+        if elapsed >= target * (len(chunks) + 1) and len(chunks) < workers - 1:
+            chunks.append((chunk, chunk_duration))
+            chunk, chunk_duration = [], 0.0
+    if chunk or not chunks:
+        chunks.append((chunk, chunk_duration))
+
+    # Pad the last chunk so the video lasts exactly `video_duration`
+    rendered = sum(duration for _, duration in chunks)
+    last_segments, last_duration = chunks[-1]
+    chunks[-1] = (last_segments, last_duration + max(0.0, video_duration - rendered))
+    return chunks
+
+
+def render_chunk(
+    segments: list[tuple[str, float]],
+    duration: float,
+    output_file: str,
+    size: tuple[int, int],
+    fps: int,
+    preset: str,
+    transition: float,
+    threads: int,
+    encoder_params: list[str],
+) -> str:
+    """Renders one chunk to a video-only MP4. Runs in a worker process."""
+    source = SegmentFrameSource(segments, transition=transition, size=size)
+    clip = VideoClip(make_frame=source, duration=duration)
+    clip.write_videofile(
+        output_file,
+        fps=fps,
+        codec="libx264",
+        audio=False,
+        threads=threads,
+        preset=preset,
+        ffmpeg_params=encoder_params or None,
+        logger=None,
+    )
+    return output_file
+
+
+def render_parallel(
+    image_folder: str,
+    image_segments: list[dict],
+    video_duration: float,
+    audio,
+    output_file: str,
+    fps: int,
+    preset: str,
+    transition: float,
+    workers: int,
+    max_size: tuple[int, int] | None = None,
+    keyframe_seconds: float = 0,
+    mux_params: list[str] = (),
+) -> str:
+    """
+    Renders the video in chunks across processes and joins them losslessly.
+    Args:
+        image_folder: Path to the folder containing images.
+        image_segments: Segments as returned by create_image_segments.
+        video_duration: Duration of the video in seconds.
+        audio: Final moviepy audio clip, or None for a silent video.
+        output_file: Path of the MP4 to write.
+        fps: Frames per second.
+        preset: libx264 preset.
+        transition: Fade-in duration in seconds at the start of each segment.
+        workers: Number of worker processes.
+        max_size: Max (width, height) of the canvas; larger images are scaled down.
+        keyframe_seconds: Force keyframes every `keyframe_seconds` of the final video (e.g. at
+            HLS segment boundaries); 0 leaves keyframe placement to the encoder.
+        mux_params: Extra ffmpeg options for the final mux (e.g. MP4 movflags).
+    Returns:
+        The path of the written video.
+    """
+    segments = [(os.path.join(image_folder, s["file"]), s["duration"]) for s in image_segments]
+    size = fit_size(canvas_size([path for path, _ in segments]), max_size)
+    chunks = plan_chunks(segments, video_duration, workers)
+    threads = max(1, (os.cpu_count() or 1) // len(chunks))
+    ffmpeg = get_setting("FFMPEG_BINARY")
+
+    work_dir = tempfile.mkdtemp(prefix="chunks_", dir=os.path.dirname(output_file) or ".")
+    try:
+        chunk_files = [os.path.join(work_dir, f"chunk_{i:04d}.mp4") for i in range(len(chunks))]
+        # Each chunk is encoded from its own t=0, so keyframes are offset by the chunk's start
+        chunk_params = []
+        chunk_start = 0.0
+        for _, chunk_duration in chunks:
+            chunk_params.append(keyframe_params(keyframe_seconds, chunk_start) if keyframe_seconds else [])
+            chunk_start += chunk_duration
+        print(f"Rendering {len(chunks)} chunks with {workers} workers...")
+        # Spawn rather than fork: the caller runs asyncio and encoder threads, and forking a
+        # threaded process can deadlock the children on locks held by other threads
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [
+                executor.submit(
+                    render_chunk, chunk_segments, chunk_duration, chunk_file,
+                    size, fps, preset, transition, threads, encoder_params,
+                )
+                for (chunk_segments, chunk_duration), chunk_file, encoder_params
+                in zip(chunks, chunk_files, chunk_params)
+            ]
+            for future in futures:
+                future.result()
+
+        concat_list = os.path.join(work_dir, "chunks.txt")
+        with open(concat_list, "w") as f:
+            for chunk_file in chunk_files:
+                f.write(f"file '{os.path.abspath(chunk_file)}'\n")
+
+        cmd = [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", concat_list]
+        if audio is not None:
+            audio_file = os.path.join(work_dir, "audio.m4a")
+            audio.write_audiofile(audio_file, fps=44100, codec="aac", logger=None)
+            cmd += ["-i", audio_file, "-map", "0:v", "-map", "1:a"]
+        cmd += ["-c", "copy", "-t", str(video_duration), *mux_params, output_file]
+        subprocess.run(cmd, check=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return output_file
@@ -0,0 +1,139 @@
+"""Quality tier selection for video jobs.
+A job runs with one named tier (see QUALITY_TIERS) that the image, dubbing and
+video tools read through `get_quality_tier`. The adaptive policy steps a job
+down from its requested tier when the queue is deep or recent stage
+latencies are over budget, trading quality for delivery time under load.
+"""
+import json
+import os
+import statistics
+import time
+from contextvars import ContextVar
+
+from config.config import QUALITY_TIERS, BackgroundScoreConfig, QualityConfig, QualityTier
+
+# Highest to lowest quality
+TIER_ORDER = list(QUALITY_TIERS)
+
+_active_tier: ContextVar[str] = ContextVar("quality_tier", default=QualityConfig.DEFAULT_TIER)
+
+
+def get_quality_tier() -> QualityTier:
+    """Returns the tier of the job running in the current context."""
+    return QUALITY_TIERS[_active_tier.get()]
+
+
+def set_quality_tier(name: str) -> None:
+    """
+    Selects the tier for the job running in the current context. Tasks and
+    threads started afterwards from this context inherit it.
+    """
+    if name not in QUALITY_TIERS:
+        raise ValueError(f"Unknown quality tier '{name}', expected one of {TIER_ORDER}")
+    _active_tier.set(name)
+
+
+def _append_jsonl(path: str, record: dict) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def stage_name(author: str) -> str:
+    """
+    Maps the author of an event to its pipeline stage, so fast-path LLM fallbacks
+    (`<stage>_llm`) and the speculative background score agent count towards
+    the stage budgets in QualityConfig.STAGE_LATENCY_BUDGETS.
+    """
+    if author == BackgroundScoreConfig.SPECULATIVE_AGENT_NAME:
+        return BackgroundScoreConfig.AGENT_NAME
+    return author.removesuffix("_llm")
+
+
+def record_stage_latencies(latencies: dict[str, float], tier: str) -> None:
+    """
+    Appends the stage latencies of a finished job to the latency log.
+    Args:
+        latencies: Seconds spent per stage (agent name).
+        tier: Tier the job ran with.
+    """
+    for stage, seconds in latencies.items():
+        _append_jsonl(
+            QualityConfig.LATENCY_LOG_FILE,
+            {"stage": stage, "seconds": round(seconds, 2), "tier": tier, "timestamp": time.time()},
+        )
+
+
+def record_job_tier(job_id: str, requested: str, tier: str, reason: str, output_folder: str = "") -> None:
+    """
+    Records which tier a job's output was produced with in the job log and,
+    if `output_folder` is given, in a QualityConfig.JOB_SIDECAR_FILE next to the output.
+    """
+    record = {"job_id": job_id, "requested_tier": requested, "tier": tier, "reason": reason, "timestamp": time.time()}
+    _append_jsonl(QualityConfig.JOB_LOG_FILE, record)
+    if output_folder:
+        os.makedirs(output_folder, exist_ok=True)
+        with open(os.path.join(output_folder, QualityConfig.JOB_SIDECAR_FILE), "w") as f:
+            json.dump(record, f, indent=2)
+
+
+def recent_stage_latencies(window: int = QualityConfig.LATENCY_WINDOW) -> dict[str, list[float]]:
+    """Returns the last `window` recorded latencies of each stage."""
+    latencies: dict[str, list[float]] = {}
+    try:
+        with open(QualityConfig.LATENCY_LOG_FILE) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                latencies.setdefault(record["stage"], []).append(record["seconds"])
+    except OSError:
+        return {}
+    return {stage: values[-window:] for stage, values in latencies.items()}
+
+
+class AdaptiveTierPolicy:
+    """
+    Steps a job down from its requested tier based on load:
+    one step per QUEUE_DEPTH_PER_STEP queued jobs, and one step if any
+    stage's recent median latency exceeds its budget.
+    """
+
+    def __init__(
+        self,
+        queue_depth_per_step: int = QualityConfig.QUEUE_DEPTH_PER_STEP,
+        stage_latency_budgets: dict = QualityConfig.STAGE_LATENCY_BUDGETS,
+    ):
+        self.queue_depth_per_step = queue_depth_per_step
+        self.stage_latency_budgets = stage_latency_budgets
+
+    def choose(self, requested: str, queue_depth: int = 0) -> tuple[str, str]:
+        """
+        Args:
+            requested: Tier requested for the job.
+            queue_depth: Number of jobs waiting behind this one.
+        Returns:
+            The tier to use and a human-readable reason.
+        """
+        steps = 0
+        reasons = []
+        if self.queue_depth_per_step > 0 and queue_depth >= self.queue_depth_per_step:
+            steps += queue_depth // self.queue_depth_per_step
+            reasons.append(f"queue depth {queue_depth}")
+
+        slow_stages = [
+            stage
+            for stage, values in recent_stage_latencies().items()
+            if stage in self.stage_latency_budgets
+            and statistics.median(values) > self.stage_latency_budgets[stage]
+        ]
+        if slow_stages:
+            steps += 1
+            reasons.append(f"slow stages {', '.join(sorted(slow_stages))}")
+
+        index = min(TIER_ORDER.index(requested) + steps, len(TIER_ORDER) - 1)
+        tier = TIER_ORDER[index]
+        if tier == requested:
+            return tier, "requested"
+        return tier, f"stepped down from {requested}: {'; '.join(reasons)}"
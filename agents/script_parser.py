@@ -0,0 +1,113 @@
+"""Parser for the video script produced by the script writer agent.
+The script writer emits one block per segment in the format described by
+SCRIPT_WRITER_PROMPT:
+
+    **(0-5)**
+    **Narrator:** "Narration line."
+    **Visual:** One image description.
+    **Background Music:** Music cue.
+
+The parsed segments let downstream stages call their tools directly
+instead of asking an LLM to read the script.
+"""
+import re
+from dataclasses import dataclass
+
+
+class ScriptParseError(ValueError):
+    """Raised when a video script does not follow the expected block format."""
+
+
+@dataclass
+class ScriptSegment:
+    """A single timed block of the video script."""
+    start: int
+    end: int
+    visual: str = ""
+    narrator: str = ""
+    background_music: str = ""
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+
+# (0-5), (0-5 seconds), (0s-5s), (0 - 5 sec)
+_TIMING_RE = re.compile(
+    r"^\(?\s*(\d+)\s*(?:s|sec|secs|seconds)?\s*[-–—]\s*(\d+)\s*(?:s|sec|secs|seconds)?\s*\)?$",
+    re.IGNORECASE,
+)
+_CUE_RE = re.compile(
+    r"^(?:\[optional\]\s*)?(narrator|visual|background music)\s*:\s*(.*)$",
+    re.IGNORECASE,
+)
+_CUE_FIELDS = {
+    "narrator": "narrator",
+    "visual": "visual",
+    "background music": "background_music",
+}
+
+
+def _clean_line(line: str) -> str:
+    """Strips markdown emphasis, bullets and code fences from a script line."""
+    line = line.strip().strip("`")
+    line = line.replace("**", "").replace("__", "")
+    return line.lstrip("*-• ").strip()
+
+
+def _clean_value(value: str) -> str:
+    return value.strip().strip('"“”').strip()
+
+
+def parse_video_script(script: str) -> list[ScriptSegment]:
+    """
+    Parses a video script into timed segments.
+    Args:
+        script: The script text written by the script writer agent.
+    Returns:
+        The list of segments ordered by start second.
+    Raises:
+        ScriptParseError: If no timed segment can be found or a segment has no visual cue.
+    """
+    if not script or not script.strip():
+        raise ScriptParseError("Video script is empty")
+
+    segments: list[ScriptSegment] = []
+    current: ScriptSegment | None = None
+    for raw_line in script.splitlines():
+        line = _clean_line(raw_line)
+        if not line:
+            continue
+        timing = _TIMING_RE.match(line)
+        if timing:
+            start, end = int(timing.group(1)), int(timing.group(2))
+            if end <= start:
+                raise ScriptParseError(f"Invalid segment timing: {line}")
+            current = ScriptSegment(start=start, end=end)
+            segments.append(current)
+            continue
+        cue = _CUE_RE.match(line)
+        if cue and current is not None:
+            field = _CUE_FIELDS[cue.group(1).lower()]
+            setattr(current, field, _clean_value(cue.group(2)))
+
+    if not segments:
+        raise ScriptParseError("No timed segments found in video script")
+    for segment in segments:
+        if not segment.visual:
+            raise ScriptParseError(
+                f"Segment ({segment.start}-{segment.end}) has no Visual cue"
+            )
+    return sorted(segments, key=lambda s: s.start)
+
+
+def segment_file_stem(segment: ScriptSegment, max_words: int = 4) -> str:
+    """
+    Builds the `<start>_<end>_<slug>` file name stem used to synchronise assets.
+    Args:
+        segment: The script segment.
+        max_words: Maximum number of words from the visual cue in the slug.
+    """
+    words = re.findall(r"[a-z0-9]+", segment.visual.lower())[:max_words]
+    slug = "_".join(words) or "scene"
+    return f"{segment.start}_{segment.end}_{slug}"
@@ -27,14 +27,18 @@ def save_script_to_file(script: str, file_name: str) -> None:
         print(f"Error saving script to file: {e}")
         return {"status": "error", "error_message": str(e)}
 
-script_writer_agent = Agent(
-    model= ScriptWriterConfig.MODEL,
-    name=ScriptWriterConfig.AGENT_NAME,
-    description=ScriptWriterConfig.DESCRIPTION,
-    instruction= prompt.SCRIPT_WRITER_PROMPT,
-    tools=[save_script_to_file],  # Include the AgentTool
-    output_key="video_script",  # Key to store the generated script
-
-)
+def create_script_writer_agent(name: str = ScriptWriterConfig.AGENT_NAME) -> Agent:
+    """Builds the script writer agent; its reply is stored in state as `video_script`."""
+    return Agent(
+        model= ScriptWriterConfig.MODEL,
+        name=name,
+        description=ScriptWriterConfig.DESCRIPTION,
+        instruction= prompt.SCRIPT_WRITER_PROMPT,
+        tools=[save_script_to_file],  # Include the AgentTool
+        output_key="video_script",  # Key to store the generated script
+
+    )
+
+script_writer_agent = create_script_writer_agent()
 
 print(f"✅ Agent '{script_writer_agent.name}' created using model '{script_writer_agent.model}'.")
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""Speculative background score composition.
+Beatoven composition is the longest stage, so a track is started from the
+mood of the raw user prompt while the script writer is still running. Once the
+script exists, its Background Music cues decide whether the speculative track
+is kept or the composition is reissued by the regular background score agent.
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from typing import AsyncGenerator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from moviepy.editor import AudioFileClip
+from typing_extensions import override
+
+from config.config import BackgroundScoreConfig
+from .bgscore_agent import create_and_compose
+from .fast_path_agents import BACKGROUND_MUSIC_FILE, DEFAULT_MUSIC_CUE, read_video_script
+from .script_parser import ScriptParseError, parse_video_script
+
+SPECULATIVE_MUSIC_FILE = os.path.join(BackgroundScoreConfig.output_dir, "background_music_speculative.mp3")
+
+# Words that signal each mood, in prompts as well as in script music cues.
+# Entries ending in "*" are stems matching any word that starts with them; they are
+# only used where no unrelated word shares the stem (e.g. "fun" would match "funeral").
+MOOD_KEYWORDS = {
+    "uplifting": ["uplift*", "inspir*", "hope", "hopes", "hopeful", "motivat*", "positive", "optimis*", "triumph*", "success*", "win", "wins", "winning", "victory", "dream", "dreams", "empower*"],
+    "calm": ["calm*", "peace", "peaceful", "relax*", "gentle", "gently", "soft", "softly", "serene", "serenity", "tranquil*", "ambient", "meditat*", "quiet", "soothing"],
+    "energetic": ["energ*", "upbeat", "fast", "excit*", "action", "sport", "sports", "sporty", "dance", "dancing", "power", "powerful", "intens*", "driving", "pulsing"],
+    "sad": ["sad", "sadness", "melanchol*", "somber", "sombre", "grief", "grieving", "loss", "lonely", "loneliness", "tragic", "tragedy", "mourn*", "nostalgi*", "hopeless"],
+    "dramatic": ["drama", "dramatic", "epic", "cinematic", "orchestr*", "suspense*", "tension", "tense", "dark", "darker", "darkness", "myster*", "thrill*", "ominous"],
+    "happy": ["happy", "happiness", "joy", "joyful", "joyous", "cheer*", "fun", "funny", "playful", "bright", "whimsic*", "bouncy", "celebrat*"],
+    "romantic": ["love", "loving", "romance", "romantic", "tender", "warm", "intimate"],
+}
+
+
+def _keyword_pattern(keywords: list[str]) -> re.Pattern:
+    alternatives = [re.escape(k[:-1]) + r"\w*" if k.endswith("*") else re.escape(k) for k in keywords]
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\b")
+
+
+MOOD_PATTERNS = {mood: _keyword_pattern(keywords) for mood, keywords in MOOD_KEYWORDS.items()}
+
+
+def infer_moods(text: str) -> set[str]:
+    """
+    Infers the set of moods mentioned in a text.
+    Args:
+        text: A user prompt or music cues.
+    """
+    text = text.lower()
+    return {mood for mood, pattern in MOOD_PATTERNS.items() if pattern.search(text)}
+
+
+def mood_similarity(a: set[str], b: set[str]) -> float:
+    """Jaccard similarity of two mood sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def speculative_music_prompt(user_prompt: str) -> str:
+    """Builds a Beatoven prompt from the moods of the raw user prompt."""
+    moods = infer_moods(user_prompt)
+    cue = f"{', '.join(sorted(moods)).capitalize()} background music" if moods else DEFAULT_MUSIC_CUE
+    return f"{cue}. {BackgroundScoreConfig.SPECULATIVE_TRACK_SECONDS} seconds long."
+
+
+def track_duration(file_name: str) -> float:
+    """Duration of an audio file in seconds, or 0 if it can't be read."""
+    try:
+        clip = AudioFileClip(file_name)
+    except Exception:
+        return 0.0
+    try:
+        return clip.duration or 0.0
+    finally:
+        clip.close()
+
+
+class SpeculativeScore:
+    """A background track composition started from the user prompt before the script exists."""
+
+    def __init__(self, user_prompt: str):
+        self.prompt = speculative_music_prompt(user_prompt)
+        self.moods = infer_moods(self.prompt)
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Starts the composition in the background. Must be called from a running event loop."""
+        print(f"🎵 Speculatively composing background music: '{self.prompt}'")
+        self.started_at = time.monotonic()
+        self.task = asyncio.create_task(create_and_compose(self.prompt, SPECULATIVE_MUSIC_FILE))
+        self.task.add_done_callback(lambda _: setattr(self, "finished_at", time.monotonic()))
+
+    def cancel(self) -> None:
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+
+def record_speculation(hit: bool, time_saved: float) -> dict:
+    """
+    Adds the outcome of one speculation to the cumulative stats file.
+    Returns:
+        The updated stats including the hit rate.
+    """
+    stats = {"runs": 0, "hits": 0, "time_saved_seconds": 0.0}
+    try:
+        with open(BackgroundScoreConfig.SPECULATION_STATS_FILE) as f:
+            stats.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    stats["runs"] += 1
+    stats["hits"] += int(hit)
+    stats["time_saved_seconds"] = round(stats["time_saved_seconds"] + time_saved, 2)
+    stats["hit_rate"] = round(stats["hits"] / stats["runs"], 3)
+    os.makedirs(os.path.dirname(BackgroundScoreConfig.SPECULATION_STATS_FILE) or ".", exist_ok=True)
+    with open(BackgroundScoreConfig.SPECULATION_STATS_FILE, "w") as f:
+        json.dump(stats, f, indent=2)
+    return stats
+
+
+class SpeculativeBackgroundScoreAgent(BaseAgent):
+    """
+    Keeps the speculative track when the script's music cues match its mood and
+    the track covers the whole script, otherwise cancels it and runs
+    `composer_agent` to compose from the script.
+    """
+    speculation: SpeculativeScore
+    composer_agent: BaseAgent
+
+    def __init__(self, speculation: SpeculativeScore, composer_agent: BaseAgent):
+        super().__init__(
+            name=BackgroundScoreConfig.SPECULATIVE_AGENT_NAME,
+            description=BackgroundScoreConfig.DESCRIPTION,
+            speculation=speculation,
+            composer_agent=composer_agent,
+            sub_agents=[composer_agent],
+        )
+
+    def _script_cues(self, ctx: InvocationContext) -> tuple[set[str], float]:
+        """Returns the moods of the script's music cues and the script length (0 if unknown)."""
+        try:
+            segments = parse_video_script(read_video_script(ctx))
+        except ScriptParseError:
+            return set(), 0.0
+        return infer_moods(" ".join(s.background_music for s in segments)), segments[-1].end
+
+    async def _await_speculation(self) -> tuple[dict, float]:
+        """Waits for the speculative track; returns its result and the seconds spent waiting."""
+        waited_from = time.monotonic()
+        try:
+            result = await self.speculation.task
+        except Exception as e:
+            result = {"status": "error", "error_message": str(e)}
+        return result, time.monotonic() - waited_from
+
+    @override
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        script_moods, script_seconds = self._script_cues(ctx)
+        similarity = mood_similarity(self.speculation.moods, script_moods)
+        # Cues without a recognisable mood give no reason to recompose
+        keep = not script_moods or similarity >= BackgroundScoreConfig.SPECULATIVE_MIN_SIMILARITY
+
+        result, waited = ({}, 0.0)
+        if keep and self.speculation.task is not None:
+            result, waited = await self._await_speculation()
+        track_seconds = 0.0
+        if keep and result.get("status") == "success":
+            track_seconds = await asyncio.to_thread(track_duration, SPECULATIVE_MUSIC_FILE)
+        # A track shorter than the script would leave the end of the video silent
+        hit = keep and result.get("status") == "success" and track_seconds >= script_seconds
+
+        if hit:
+            os.replace(SPECULATIVE_MUSIC_FILE, BACKGROUND_MUSIC_FILE)
+            result = {"status": "success", "file": BACKGROUND_MUSIC_FILE}
+            # Without speculation the whole composition would have started now
+            finished_at = self.speculation.finished_at or time.monotonic()
+            time_saved = finished_at - self.speculation.started_at - waited
+        else:
+            self.speculation.cancel()
+            time_saved = -waited
+
+        stats = record_speculation(hit, time_saved)
+        report = {
+            "hit": hit,
+            "prompt_moods": sorted(self.speculation.moods),
+            "script_moods": sorted(script_moods),
+            "similarity": round(similarity, 3),
+            "track_seconds": round(track_seconds, 2),
+            "script_seconds": script_seconds,
+            "time_saved_seconds": round(time_saved, 2),
+            "hit_rate": stats["hit_rate"],
+            "total_time_saved_seconds": stats["time_saved_seconds"],
+        }
+        print(
+            f"🎵 Speculative background music {'kept' if hit else 'discarded'} "
+            f"(similarity {report['similarity']}, saved {report['time_saved_seconds']}s, "
+            f"hit rate {stats['hit_rate']:.0%} over {stats['runs']} runs)"
+        )
+
+        state_delta = {"bgscore_speculation": report}
+        if hit:
+            state_delta["background_music"] = result
+        # Later LLM agents see this text in their prompt, so it must not carry per-run
+        # metrics (they would also make every later request an LLM cache miss)
+        summary = json.dumps(result) if hit else "Speculative background music discarded; composing from the script."
+        yield Event(
+            author=self.name,
+            invocation_id=ctx.invocation_id,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=summary)]),
+            actions=EventActions(state_delta=state_delta),
+        )
+        if not hit:
+            async for event in self.composer_agent.run_async(ctx):
+                yield event
@@ -0,0 +1,240 @@
+"""Streaming-ready packaging of the rendered video.
+Provides the ffmpeg options for faststart or fragmented MP4 output, packages
+the rendered MP4 as HLS (the source rendition is stream-copied, optional
+lower renditions are transcoded) and extracts a poster thumbnail.
+"""
+import math
+import os
+import re
+import subprocess
+
+from moviepy.config import get_setting
+
+MP4_LAYOUTS = ("standard", "faststart", "fragmented")
+
+
+def mp4_params(layout: str) -> list[str]:
+    """
+    Returns the ffmpeg options for an MP4 layout.
+    Args:
+        layout: "standard" (moov atom at the end), "faststart" (moov atom first, playback
+            can start before the download ends) or "fragmented" (fragmented MP4).
+    """
+    if layout == "faststart":
+        return ["-movflags", "+faststart"]
+    if layout == "fragmented":
+        return ["-movflags", "+frag_keyframe+empty_moov+default_base_moof"]
+    if layout != "standard":
+        raise ValueError(f"Unknown MP4 layout '{layout}', expected one of {MP4_LAYOUTS}")
+    return []
+
+
+def keyframe_params(segment_seconds: float, start: float = 0.0) -> list[str]:
+    """
+    ffmpeg options forcing a keyframe at every HLS segment boundary.
+    Args:
+        segment_seconds: HLS segment duration.
+        start: Position in the final video of the encoded part's first frame, for parts
+            encoded separately (e.g. chunks of the parallel renderer), so the keyframes
+            land on the video's segment grid rather than restarting at the part's t=0.
+    """
+    first = math.ceil(start / segment_seconds) * segment_seconds - start
+    return ["-force_key_frames", f"expr:gte(t,{first:g}+n_forced*{segment_seconds})"]
+
+
+def _playlist_segments(playlist: str) -> list[tuple[str, float]]:
+    """(segment path, EXTINF duration) of each segment of a media playlist."""
+    folder = os.path.dirname(playlist)
+    segments = []
+    duration = None
+    with open(playlist) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("#EXTINF:"):
+                duration = float(line[len("#EXTINF:"):].split(",")[0])
+            elif line and not line.startswith("#") and duration:
+                segments.append((os.path.join(folder, line), duration))
+                duration = None
+    if not segments:
+        raise ValueError(f"No segments in playlist {playlist}")
+    return segments
+
+
+def playlist_bandwidth(playlist: str) -> tuple[int, int]:
+    """
+    Peak and average bit rate of a media playlist's segments, as required for
+    BANDWIDTH and AVERAGE-BANDWIDTH in the master playlist.
+    Args:
+        playlist: Path of the media playlist (.m3u8); segments are resolved relative to it.
+    Returns:
+        (peak, average) in bits per second.
+    """
+    segments = [(os.path.getsize(path) * 8, seconds) for path, seconds in _playlist_segments(playlist)]
+    peak = max(bits / seconds for bits, seconds in segments)
+    average = sum(bits for bits, _ in segments) / sum(seconds for _, seconds in segments)
+    return math.ceil(peak), math.ceil(average)
+
+
+# Annex B start code of an H.264 sequence parameter set NAL unit (type 7, nal_ref_idc > 0)
+_SPS_START = re.compile(b"\x00\x00\x01[\x27\x47\x67]")
+_TS_PACKET = 188
+_TS_H264, _TS_AAC = 0x1B, 0x0F  # MPEG-TS stream types
+
+
+def _ts_payloads(data: bytes):
+    """Yields (PID, payload unit start, payload) for each MPEG-TS packet."""
+    for offset in range(0, len(data) - _TS_PACKET + 1, _TS_PACKET):
+        packet = data[offset:offset + _TS_PACKET]
+        if packet[0] != 0x47:
+            raise ValueError("Not an MPEG-TS segment")
+        pid = ((packet[1] & 0x1F) << 8) | packet[2]
+        start = 4 + (packet[4] + 1 if packet[3] & 0x20 else 0)
+        if packet[3] & 0x10 and start < _TS_PACKET:
+            yield pid, bool(packet[1] & 0x40), packet[start:]
+
+
+def _ts_first_pes(data: bytes) -> dict[int, bytes]:
+    """
+    Maps each elementary stream type of an MPEG-TS segment (from its program
+    map table) to the payload of the stream's first PES packet.
+    """
+    pmt_pids, stream_pids = set(), {}
+    pes: dict[int, bytearray] = {}
+    done = set()
+    for pid, unit_start, payload in _ts_payloads(data):
+        if unit_start and (pid == 0 or pid in pmt_pids):
+            section = payload[1 + payload[0]:]  # skip the pointer field
+            end = 3 + (((section[1] & 0x0F) << 8) | section[2]) - 4  # drop the CRC
+            if pid == 0:
+                for i in range(8, end, 4):
+                    if (section[i] << 8) | section[i + 1]:  # program 0 is the network PID
+                        pmt_pids.add(((section[i + 2] & 0x1F) << 8) | section[i + 3])
+            else:
+                i = 12 + (((section[10] & 0x0F) << 8) | section[11])
+                while i + 5 <= end:
+                    stream_pids[((section[i + 1] & 0x1F) << 8) | section[i + 2]] = section[i]
+                    i += 5 + (((section[i + 3] & 0x0F) << 8) | section[i + 4])
+        elif pid in stream_pids and pid not in done:
+            if unit_start and pid in pes:
+                done.add(pid)
+            elif unit_start:
+                pes[pid] = bytearray(payload[9 + payload[8]:])  # skip the PES header
+            elif pid in pes:
+                pes[pid] += payload
+    return {stream_pids[pid]: bytes(payload) for pid, payload in pes.items()}
+
+
+def stream_codecs(segment_file: str) -> str:
+    """
+    RFC 6381 CODECS attribute (e.g. "avc1.64001F,mp4a.40.2") of an HLS segment,
+    read from the encoded streams: the H.264 profile, constraint flags and level
+    from the first sequence parameter set, the AAC object type from the first
+    ADTS header. (Parsed directly; some static ffmpeg builds crash probing TS.)
+    """
+    with open(segment_file, "rb") as f:
+        streams = _ts_first_pes(f.read())
+    sps = _SPS_START.search(streams.get(_TS_H264, b""))
+    if not sps or len(sps.string) < sps.end() + 3:
+        raise ValueError(f"No H.264 sequence parameter set in {segment_file}")
+    profile, constraints, level = sps.string[sps.end():sps.end() + 3]
+    codecs = [f"avc1.{profile:02X}{constraints:02X}{level:02X}"]
+    adts = streams.get(_TS_AAC, b"")
+    if len(adts) > 2 and adts[0] == 0xFF and adts[1] & 0xF0 == 0xF0:
+        codecs.append(f"mp4a.40.{(adts[2] >> 6) + 1}")
+    return ",".join(codecs)
+
+
+def parse_renditions(value: str) -> tuple:
+    """
+    Parses HLS renditions given as "height:bitrate" pairs, e.g. "720:2500k,480:1000k".
+    Returns:
+        ((720, "2500k"), (480, "1000k")), the format package_hls takes.
+    """
+    renditions = []
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        height, _, bitrate = item.partition(":")
+        if not height.isdigit() or not bitrate:
+            raise ValueError(f"Invalid HLS rendition '{item}', expected height:bitrate such as 720:2500k")
+        renditions.append((int(height), bitrate))
+    return tuple(renditions)
+
+
+def _run_ffmpeg(args: list[str]) -> None:
+    subprocess.run([get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error", *args], check=True)
+
+
+def _hls_args(segment_seconds: float, folder: str, name: str) -> list[str]:
+    return [
+        "-f", "hls",
+        "-hls_time", str(segment_seconds),
+        "-hls_playlist_type", "vod",
+        "-hls_segment_filename", os.path.join(folder, f"{name}_%03d.ts"),
+        os.path.join(folder, f"{name}.m3u8"),
+    ]
+
+
+def package_hls(
+    video_file: str,
+    output_folder: str,
+    size: tuple[int, int],
+    segment_seconds: float = 4,
+    renditions: tuple = (),
+) -> str:
+    """
+    Packages a rendered MP4 as HLS with a master playlist.
+    Args:
+        video_file: The rendered MP4 (H.264/AAC).
+        output_folder: Folder for the playlists and segments.
+        size: (width, height) of the rendered video.
+        segment_seconds: Target HLS segment duration.
+        renditions: Extra (height, video bitrate) renditions, e.g. ((720, "2500k"),).
+            Renditions not smaller than the source are skipped.
+    Returns:
+        The path of the master playlist.
+    """
+    os.makedirs(output_folder, exist_ok=True)
+
+    # The source rendition is remuxed from the render without re-encoding
+    _run_ffmpeg(["-i", video_file, "-c", "copy", *_hls_args(segment_seconds, output_folder, "source")])
+    variants = [("source.m3u8", size)]
+
+    for height, bitrate in sorted(renditions, reverse=True):
+        if height >= size[1]:
+            continue
+        width = int(size[0] * height / size[1]) // 2 * 2
+        name = f"{height}p"
+        _run_ffmpeg([
+            "-i", video_file,
+            "-vf", f"scale={width}:{height}",
+            "-c:v", "libx264", "-b:v", bitrate, "-maxrate", bitrate, "-bufsize", bitrate,
+            *keyframe_params(segment_seconds),
+            "-c:a", "aac", "-b:a", "128k",
+            *_hls_args(segment_seconds, output_folder, name),
+        ])
+        variants.append((f"{name}.m3u8", (width, height)))
+
+    master_playlist = os.path.join(output_folder, "master.m3u8")
+    with open(master_playlist, "w") as f:
+        f.write("#EXTM3U\n#EXT-X-VERSION:3\n")
+        for playlist, (width, height) in variants:
+            # BANDWIDTH must be the peak segment bit rate, measured from the written segments
+            media_playlist = os.path.join(output_folder, playlist)
+            peak, average = playlist_bandwidth(media_playlist)
+            codecs = stream_codecs(_playlist_segments(media_playlist)[0][0])
+            f.write(
+                f'#EXT-X-STREAM-INF:BANDWIDTH={peak},AVERAGE-BANDWIDTH={average},'
+                f'CODECS="{codecs}",RESOLUTION={width}x{height}\n{playlist}\n'
+            )
+    return master_playlist
+
+
+def create_poster(video_file: str, poster_file: str, at_seconds: float) -> str:
+    """
+    Extracts a single frame of the video as a JPEG poster thumbnail.
+    Args:
+        video_file: The rendered video.
+        poster_file: Path of the JPEG to write.
+        at_seconds: Time of the frame to extract.
+    """
+    _run_ffmpeg(["-ss", str(at_seconds), "-i", video_file, "-frames:v", "1", "-q:v", "2", poster_file])
+    return poster_file
@@ -0,0 +1,140 @@
+"""Bounded-memory renderer for long-form videos.
+Instead of building an ImageClip per segment and compositing them, frames are
+generated lazily from the image segments. Only the images of the current and
+next segment are held in memory, and moviepy pipes each frame straight to the
+ffmpeg encoder, so peak memory does not grow with the number of segments.
+"""
+import bisect
+import os
+
+import numpy as np
+from PIL import Image
+from moviepy.video.VideoClip import VideoClip
+
+
+def canvas_size(paths: list[str]) -> tuple[int, int]:
+    """
+    Largest (width, height) over the given images, rounded up to even dimensions
+    as required by yuv420p encoding. Reads image headers only.
+    """
+    width, height = 0, 0
+    for path in paths:
+        if path and os.path.exists(path):
+            with Image.open(path) as image:
+                width, height = max(width, image.width), max(height, image.height)
+    return (max(2, width + width % 2), max(2, height + height % 2))
+
+
+def fit_size(size: tuple[int, int], max_size: tuple[int, int] | None) -> tuple[int, int]:
+    """Scales `size` down to fit within `max_size`, keeping the aspect ratio and even dimensions."""
+    if not max_size:
+        return size
+    scale = min(1.0, max_size[0] / size[0], max_size[1] / size[1])
+    if scale == 1.0:
+        return size
+    return (max(2, int(size[0] * scale) // 2 * 2), max(2, int(size[1] * scale) // 2 * 2))
+
+
+def load_fitted_image(path: str, max_size: tuple[int, int] | None) -> np.ndarray:
+    """Loads an image as an RGB array, scaled down with LANCZOS to fit within `max_size`."""
+    with Image.open(path) as image:
+        image = image.convert("RGB")
+        fitted = fit_size(image.size, max_size)
+        if fitted != image.size:
+            image = image.resize(fitted, Image.LANCZOS)
+        return np.asarray(image)
+
+
+class SegmentFrameSource:
+    """
+    Callable `make_frame(t)` for a moviepy VideoClip built from image segments.
+    Matches the compose renderer: images are centered on a black canvas the size
+    of the largest image (scaled down to fit a smaller canvas) and every segment
+    fades in from black.
+    """
+
+    def __init__(
+        self,
+        segments: list[tuple[str, float]],
+        transition: float = 1.0,
+        size: tuple[int, int] | None = None,
+    ):
+        """
+        Args:
+            segments: (image path, duration in seconds) for each segment, in order.
+                Missing images are rendered as black frames.
+            transition: Fade-in duration in seconds at the start of each segment.
+            size: (width, height) of the canvas. Defaults to the largest image size.
+        """
+        self.paths = [path for path, _ in segments]
+        self.starts = []
+        current_time = 0.0
+        for _, duration in segments:
+            self.starts.append(current_time)
+            current_time += duration
+        self.end = current_time
+        self.transition = transition
+        self.size = size or canvas_size(self.paths)
+        self._black = np.zeros((self.size[1], self.size[0], 3), dtype=np.uint8)
+        self._cache: dict[int, np.ndarray] = {}
+
+    def _load(self, index: int) -> np.ndarray:
+        path = self.paths[index]
+        if not path or not os.path.exists(path):
+            print(f"Image not found: {path}. Using a black placeholder.")
+            return self._black
+        frame = load_fitted_image(path, self.size)
+        if (frame.shape[1], frame.shape[0]) == self.size:
+            return frame
+        canvas = self._black.copy()
+        top = (self.size[1] - frame.shape[0]) // 2
+        left = (self.size[0] - frame.shape[1]) // 2
+        canvas[top:top + frame.shape[0], left:left + frame.shape[1]] = frame
+        return canvas
+
+    def image(self, index: int) -> np.ndarray:
+        """Returns the canvas-sized image of a segment, keeping only it and the next one cached."""
+        # The next image is preloaded, so `index` is usually a cache hit; prune on every call
+        self._cache = {i: img for i, img in self._cache.items() if index <= i <= index + 1}
+        if index not in self._cache:
+            self._cache[index] = self._load(index)
+        if index + 1 < len(self.paths) and index + 1 not in self._cache:
+            self._cache[index + 1] = self._load(index + 1)
+        return self._cache[index]
+
+    def __call__(self, t: float) -> np.ndarray:
+        if t < 0 or t >= self.end or not self.paths:
+            return self._black
+        index = bisect.bisect_right(self.starts, t) - 1
+        frame = self.image(index)
+        elapsed = t - self.starts[index]
+        if self.transition > 0 and elapsed < self.transition:
+            return (frame * (elapsed / self.transition)).astype(np.uint8)
+        return frame
+
+
+def create_streaming_visuals(
+    image_folder: str,
+    image_segments: list[dict],
+    video_duration: float,
+    transition: float = 1.0,
+    max_size: tuple[int, int] | None = None,
+) -> VideoClip:
+    """
+    Creates a lazily rendered clip for the image segments.
+    Args:
+        image_folder: Path to the folder containing images.
+        image_segments: Segments as returned by create_image_segments.
+        video_duration: Duration of the video in seconds.
+        transition: Fade-in duration in seconds at the start of each segment.
+        max_size: Max (width, height) of the canvas; larger images are scaled down.
+    Returns:
+        A VideoClip whose frames are generated on demand.
+    """
+    segments = [(os.path.join(image_folder, s["file"]), s["duration"]) for s in image_segments]
+    source = SegmentFrameSource(
+        segments,
+        transition=transition,
+        size=fit_size(canvas_size([path for path, _ in segments]), max_size),
+    )
+    return VideoClip(make_frame=source, duration=video_duration)
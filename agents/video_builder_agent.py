@@ -5,6 +5,7 @@ from google.adk.agents import LlmAgent
 
 from moviepy.editor import (
     ImageClip,
+    ColorClip,
     TextClip,
     AudioFileClip,
     CompositeVideoClip,
@@ -13,6 +14,10 @@ from moviepy.editor import (
 )
 
 from . import prompt
+from .quality import get_quality_tier
+from .streaming_renderer import create_streaming_visuals, load_fitted_image
+from .parallel_renderer import render_parallel
+from .stream_packager import create_poster, keyframe_params, mp4_params, package_hls, parse_renditions
 from config.config import VideoBuilderConfig
 
 def create_image_segments(folder_path: str) -> list[dict]:
@@ -49,12 +54,33 @@ def create_video(output_folder:str, image_folder: str, voice_over_file: str, bac
     Returns:
         A dictionary containing the status and the path to the created video file.
     """
+    return render_video(
+        output_folder,
+        image_folder,
+        voice_over_file,
+        background_music_file,
+        video_duration,
+        render_mode=VideoBuilderConfig.RENDER_MODE,
+    )
+
+
+def render_video(output_folder:str, image_folder: str, voice_over_file: str, background_music_file: str, video_duration:int, render_mode:str) -> dict:
+    """
+    Renders the video with an explicit render mode. Not exposed to the LLM agent,
+    which uses create_video and the configured VideoBuilderConfig.RENDER_MODE.
+    Args:
+        render_mode: "compose" builds a moviepy clip per image, "streaming" generates frames lazily
+            with bounded memory for long videos, "parallel" renders chunks of the timeline in
+            separate processes.
+        Other arguments as for create_video.
+    """
     # --- Configuration ---
     output_video_file = os.path.join(output_folder, "final_video.mp4")
     image_segments = create_image_segments(image_folder)
     #video_duration = 30  # seconds
-    fps = 24
-    video_size = (1960, 1080) # width, height # insta video size
+    tier = get_quality_tier()
+    fps = tier.fps
+    video_size = tier.video_size # max (width, height), larger images are scaled down
 
     # Create output folder if it doesn't exist
     if not os.path.exists(output_folder):
@@ -82,28 +108,40 @@ def create_video(output_folder:str, image_folder: str, voice_over_file: str, bac
         background_music = None
 
     # --- Create Video Clips from Images ---
-    video_clips = []
-    current_time = 0
-    for i, segment in enumerate(image_segments):
-        image_path = os.path.join(image_folder, segment["file"])
-        duration = segment["duration"]
+    if render_mode in ("streaming", "parallel"):
+        # Frames are generated on demand and piped to the encoder, holding at most two images
+        final_video_visuals = create_streaming_visuals(
+            image_folder,
+            image_segments,
+            video_duration,
+            transition=VideoBuilderConfig.TRANSITION_SECONDS,
+            max_size=video_size,
+        )
+    else:
+        video_clips = []
+        current_time = 0
+        for i, segment in enumerate(image_segments):
+            image_path = os.path.join(image_folder, segment["file"])
+            duration = segment["duration"]
         
-        if not os.path.exists(image_path):
-            print(f"Image not found: {image_path}. Using a black placeholder.")
-            # Create a black clip as a placeholder
-            clip = ColorClip(size=video_size, color=(0,0,0), duration=duration, ismask=False)
-        else:
-            clip = ImageClip(image_path, duration=duration)
+            if not os.path.exists(image_path):
+                print(f"Image not found: {image_path}. Using a black placeholder.")
+                # Create a black clip as a placeholder
+                clip = ColorClip(size=video_size, color=(0,0,0), duration=duration, ismask=False)
+            else:
+                # Scale down with PIL before building the clip; moviepy's resize needs Image.ANTIALIAS,
+                # which Pillow 10 removed
+                clip = ImageClip(load_fitted_image(image_path, video_size), duration=duration)
 
-        clip = clip.set_start(current_time).set_duration(duration)
-        # add transition effect to clip
-        clip = clip.crossfadein(1) # 1 second crossfade effect
-        video_clips.append(clip)
-        current_time += duration
+            clip = clip.set_start(current_time).set_duration(duration)
+            # add transition effect to clip
+            clip = clip.crossfadein(VideoBuilderConfig.TRANSITION_SECONDS) # 1 second crossfade effect
+            video_clips.append(clip)
+            current_time += duration
         
-    # --- Concatenate all visual clips ---
-    final_video_visuals = concatenate_videoclips(video_clips, method="compose")
-    final_video_visuals = final_video_visuals.set_duration(video_duration)
+        # --- Concatenate all visual clips ---
+        final_video_visuals = concatenate_videoclips(video_clips, method="compose")
+        final_video_visuals = final_video_visuals.set_duration(video_duration)
 
     # --- Combine Audio ---
     # Set voice over as the main audio for the visual composition
@@ -118,27 +156,79 @@ def create_video(output_folder:str, image_folder: str, voice_over_file: str, bac
     # Ensure final video is exactly `video_duration`
     final_video = final_video.subclip(0, video_duration)
 
+    # --- Streaming output options ---
+    mux_params = mp4_params(VideoBuilderConfig.MP4_LAYOUT)
+    # HLS segments must start on keyframes
+    keyframes = keyframe_params(VideoBuilderConfig.HLS_SEGMENT_SECONDS) if VideoBuilderConfig.HLS_ENABLED else []
+
     # --- Write Video File ---
+    video_written = False
+    write_error = ""
     try:
         print(f"Writing video to {output_video_file}...")
-        final_video.write_videofile(
-            output_video_file,
-            fps=fps,
-            codec='libx264',          # Common codec
-            audio_codec='aac',        # Common audio codec
-            temp_audiofile='temp-audio.m4a', # Temporary audio file
-            remove_temp=True,         # Remove temp audio file
-            threads=4,                # Number of threads for encoding
-            preset='medium'           # Encoding speed/quality trade-off
-        )
+        if render_mode == "parallel":
+            render_parallel(
+                image_folder,
+                image_segments,
+                video_duration,
+                final_video.audio,
+                output_video_file,
+                fps=fps,
+                preset=tier.x264_preset,
+                transition=VideoBuilderConfig.TRANSITION_SECONDS,
+                workers=VideoBuilderConfig.RENDER_WORKERS,
+                max_size=video_size,
+                keyframe_seconds=VideoBuilderConfig.HLS_SEGMENT_SECONDS if VideoBuilderConfig.HLS_ENABLED else 0,
+                mux_params=mux_params,
+            )
+        else:
+            final_video.write_videofile(
+                output_video_file,
+                fps=fps,
+                codec='libx264',          # Common codec
+                audio_codec='aac',        # Common audio codec
+                temp_audiofile='temp-audio.m4a', # Temporary audio file
+                remove_temp=True,         # Remove temp audio file
+                threads=4,                # Number of threads for encoding
+                preset=tier.x264_preset,  # Encoding speed/quality trade-off
+                ffmpeg_params=(keyframes + mux_params) or None
+            )
+        video_written = True
         print("Video created successfully!")
     except Exception as e:
+        write_error = str(e)
         print(f"Error writing video file: {e}")
         if "IMAGEMAGICK_BINARY" in str(e):
             print("This error might be related to ImageMagick not being found.")
             print("Please ensure ImageMagick is installed and in your system's PATH,")
             print("or specify its path using: change_settings({'IMAGEMAGICK_BINARY': r'/path/to/convert'})")
 
+    # --- Package for streaming ---
+    if video_written:
+        result = {"status": "success", "video_path": output_video_file, "quality_tier": tier.name}
+    else:
+        result = {"status": "error", "error_message": write_error}
+    if video_written and VideoBuilderConfig.HLS_ENABLED:
+        try:
+            result["hls_playlist"] = package_hls(
+                output_video_file,
+                os.path.join(output_folder, "hls"),
+                final_video.size,
+                segment_seconds=VideoBuilderConfig.HLS_SEGMENT_SECONDS,
+                renditions=parse_renditions(VideoBuilderConfig.HLS_RENDITIONS),
+            )
+            print(f"HLS package created: {result['hls_playlist']}")
+        except Exception as e:
+            print(f"Error packaging HLS: {e}")
+    if video_written and VideoBuilderConfig.POSTER_ENABLED:
+        try:
+            # Just after the first fade-in, so the poster isn't black
+            poster_at = min(VideoBuilderConfig.TRANSITION_SECONDS + 0.5, video_duration / 2)
+            result["poster"] = create_poster(output_video_file, os.path.join(output_folder, "poster.jpg"), poster_at)
+            print(f"Poster created: {result['poster']}")
+        except Exception as e:
+            print(f"Error creating poster: {e}")
+
     # Clean up audio clips
     if voice_over_audio:
         voice_over_audio.close()
@@ -150,14 +240,18 @@ def create_video(output_folder:str, image_folder: str, voice_over_file: str, bac
     if final_video_visuals: # Should be final_video? No, individual clips are closed by concatenate or final write.
         pass
     # --- Return the final video path ---
-    return {"status": "success", "video_path": output_video_file}
-
-video_builder_agent = LlmAgent(
-    model= VideoBuilderConfig.MODEL,
-    name=VideoBuilderConfig.AGENT_NAME,
-    description=VideoBuilderConfig.DESCRIPTION,
-    instruction= prompt.VIDEO_BUILDER_PROMPT,
-    tools=[create_video] # Include the AgentTool
-)
+    return result
+
+def create_video_builder_agent(name: str = VideoBuilderConfig.AGENT_NAME) -> LlmAgent:
+    """Builds an LLM agent that assembles the final video with `create_video`."""
+    return LlmAgent(
+        model= VideoBuilderConfig.MODEL,
+        name=name,
+        description=VideoBuilderConfig.DESCRIPTION,
+        instruction= prompt.VIDEO_BUILDER_PROMPT,
+        tools=[create_video] # Include the AgentTool
+    )
+
+video_builder_agent = create_video_builder_agent()
 
 print(f"✅ Agent '{video_builder_agent.name}' created using model '{video_builder_agent.model}'.")
\ No newline at end of file
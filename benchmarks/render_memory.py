@@ -0,0 +1,128 @@
+"""Benchmark peak memory and wall time of the video renderers against video length.
+Generates synthetic image segments and silent audio, then renders them with
+render_video in a fresh process per run and reports the peak RSS
+of the rendering process (parallel workers are measured separately by the OS
+and not included), the wall time and the speedup over the streaming renderer,
+which encodes the same frames in a single process.
+
+Usage:
+    python -m benchmarks.render_memory --segments 10 50 200 --modes compose streaming parallel
+    python -m benchmarks.render_memory --segments 50 --modes streaming parallel --workers 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import resource
+import sys
+import tempfile
+import time
+import wave
+
+from PIL import Image
+
+IMAGE_SIZE = (1024, 1536)  # Matches ImageProducerConfig.IMAGE_SIZE
+SEGMENT_SECONDS = 2
+
+
+def write_silent_wav(path: str, duration: int, rate: int = 44100) -> None:
+    with wave.open(path, "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"\x00\x00\x00\x00" * rate * duration)
+
+
+def prepare_assets(folder: str, segments: int) -> int:
+    """Creates `segments` images named like the image producer does and matching audio."""
+    image_folder = os.path.join(folder, "images")
+    os.makedirs(image_folder, exist_ok=True)
+    for i in range(segments):
+        start, end = i * SEGMENT_SECONDS, (i + 1) * SEGMENT_SECONDS
+        color = ((i * 37) % 256, (i * 91) % 256, (i * 53) % 256)
+        Image.new("RGB", IMAGE_SIZE, color).save(os.path.join(image_folder, f"{start}_{end}_scene.png"))
+    duration = segments * SEGMENT_SECONDS
+    write_silent_wav(os.path.join(folder, "dubbing.wav"), duration)
+    write_silent_wav(os.path.join(folder, "background_music.wav"), duration)
+    return duration
+
+
+def _render(folder: str, duration: int, mode: str, workers: int, result_queue) -> None:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from agents.video_builder_agent import render_video
+    from config.config import VideoBuilderConfig
+
+    VideoBuilderConfig.RENDER_WORKERS = workers
+
+    started = time.perf_counter()
+    result = render_video(
+        output_folder=os.path.join(folder, mode),
+        image_folder=os.path.join(folder, "images"),
+        voice_over_file=os.path.join(folder, "dubbing.wav"),
+        background_music_file=os.path.join(folder, "background_music.wav"),
+        video_duration=duration,
+        render_mode=mode,
+    )
+    elapsed = time.perf_counter() - started
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    result_queue.put((peak_mb, elapsed, (result or {}).get("status", "error")))
+
+
+def measure(folder: str, duration: int, mode: str, workers: int) -> tuple[float, float, str]:
+    """Renders in a spawned process so every run starts from a clean heap."""
+    context = multiprocessing.get_context("spawn")
+    result_queue = context.Queue()
+    process = context.Process(target=_render, args=(folder, duration, mode, workers, result_queue))
+    process.start()
+    while True:
+        try:
+            result = result_queue.get(timeout=5)
+            break
+        except queue.Empty:
+            # The child died (e.g. killed for running out of memory) without reporting back
+            if not process.is_alive():
+                process.join()
+                return (float("nan"), float("nan"), f"exit code {process.exitcode}")
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--segments", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--modes", nargs="+", default=["compose", "streaming"])
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[os.cpu_count() or 1],
+        help="Worker counts to run the parallel mode with (default: all cores)",
+    )
+    args = parser.parse_args()
+
+    rows = []
+    for segments in args.segments:
+        with tempfile.TemporaryDirectory() as folder:
+            duration = prepare_assets(folder, segments)
+            streaming_elapsed = None
+            for mode in args.modes:
+                for workers in args.workers if mode == "parallel" else [1]:
+                    peak_mb, elapsed, status = measure(folder, duration, mode, workers)
+                    if mode == "streaming":
+                        streaming_elapsed = elapsed
+                    speedup = streaming_elapsed / elapsed if streaming_elapsed else float("nan")
+                    rows.append((mode, workers, segments, duration, peak_mb, elapsed, speedup, status))
+
+    print(f"\n(os.cpu_count() = {os.cpu_count()})")
+    print(
+        f"{'mode':<10} {'workers':>7} {'segments':>8} {'seconds':>8} {'peak RSS MB':>12} "
+        f"{'wall s':>8} {'speedup':>8}  status"
+    )
+    for mode, workers, segments, duration, peak_mb, elapsed, speedup, status in rows:
+        print(
+            f"{mode:<10} {workers:>7} {segments:>8} {duration:>8} {peak_mb:>12.1f} "
+            f"{elapsed:>8.1f} {speedup:>8.2f}  {status}"
+        )
+
+
+if __name__ == "__main__":
+    main()
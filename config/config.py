@@ -24,6 +24,9 @@ class DirectorConfig(AgentConfig):
     AGENT_NAME: str = "director_agent"
     DESCRIPTION: str = "Root agent to generate a video from a user prompt. This agent coordinates the entire video generation process by calling other agents in sequence."
     MODEL: str = "gemini-2.5-pro-preview-03-25"
+    # Fast path: only the script writer uses an LLM, the remaining stages call their tools directly
+    FAST_PATH_AGENT_NAME: str = "fast_path_director_agent"
+    FAST_PATH_DESCRIPTION: str = "Root agent to generate a video from a user prompt. Only the script is written by an LLM; images, narration, music and the final video are produced by calling the tools directly from the parsed script."
 
 @dataclass
 class ScriptWriterConfig(AgentConfig):
@@ -43,6 +46,7 @@ class ImageProducerConfig(AgentConfig):
     IMAGE_QUALITY: str = "low"  # Choose a supported quality (low, medium, high)
     IMAGE_COUNT: int = 1  # Number of images to generate
     IMAGE_FORMAT: str = "b64_json"  # Format of the image data returned by the API
+    IMAGE_CONCURRENCY: int = 4  # Max parallel image requests in the fast path
 
 @dataclass
 class DubbingArtistConfig(AgentConfig):
@@ -52,6 +56,7 @@ class DubbingArtistConfig(AgentConfig):
     MODEL: str = "gemini-2.5-pro-preview-03-25"
     OPENAI_MODEL: str = "gpt-4o-mini-tts"
     VOICE: str = "coral"
+    TTS_INSTRUCTION: str = "Speak in a clear, engaging and warm narrator tone. Pause briefly between sentences."  # Used by the fast path
 
 @dataclass
 class BackgroundScoreConfig(AgentConfig):
@@ -59,6 +64,11 @@ class BackgroundScoreConfig(AgentConfig):
     AGENT_NAME: str = "bgscore_agent"
     DESCRIPTION: str = "Background score producer Agent to generate background music for given script. This agent is responsible for generating background music based on the provided script."
     MODEL: str = "gemini-2.5-pro-preview-03-25"
+    # Speculative composition: start a track from the user prompt while the script is being written
+    SPECULATIVE_AGENT_NAME: str = "speculative_bgscore_agent"
+    SPECULATIVE_TRACK_SECONDS: int = 30  # Length requested for the speculative track; scripts are written for 30 seconds
+    SPECULATIVE_MIN_SIMILARITY: float = 0.5  # Mood overlap (Jaccard) between prompt and script cues needed to keep the speculative track
+    SPECULATION_STATS_FILE: str = "output/bgscore_speculation_stats.json"  # Cumulative hit-rate and time saved
 
 @dataclass
 class VideoBuilderConfig(AgentConfig):
@@ -66,6 +76,85 @@ class VideoBuilderConfig(AgentConfig):
     AGENT_NAME: str = "video_builder_agent"
     DESCRIPTION: str = "Agent which uses previously generated images and audio to create a video. This agent is responsible for generating a video based on the provided instruction."
     MODEL: str = "gemini-2.5-pro-preview-03-25"
+    RENDER_MODE: str = os.getenv("VIDEO_RENDER_MODE", "compose")  # compose (moviepy clip graph), streaming (bounded memory) or parallel (chunks across processes)
+    RENDER_WORKERS: int = int(os.getenv("VIDEO_RENDER_WORKERS", str(os.cpu_count() or 1)))  # Processes used by the parallel render mode
+    X264_PRESET: str = "medium"  # Encoding speed/quality trade-off
+    FPS: int = 24
+    VIDEO_SIZE: tuple = (1024, 1536)  # Max canvas (width, height); larger images are scaled down to fit
+    # Streaming-ready output
+    MP4_LAYOUT: str = os.getenv("VIDEO_MP4_LAYOUT", "standard")  # standard, faststart (moov atom first) or fragmented
+    HLS_ENABLED: bool = os.getenv("VIDEO_HLS", "0") == "1"  # Also write an HLS package to output/hls/
+    HLS_SEGMENT_SECONDS: int = 4
+    HLS_RENDITIONS: str = os.getenv("VIDEO_HLS_RENDITIONS", "")  # Extra height:video bitrate renditions, e.g. "720:2500k,480:1000k"
+    POSTER_ENABLED: bool = os.getenv("VIDEO_POSTER", "0") == "1"  # Also write output/poster.jpg
+    TRANSITION_SECONDS: float = 1  # Fade-in at the start of each image segment
+
+@dataclass
+class LLMCacheConfig(AgentConfig):
+    """Configuration for the on-disk LLM response cache (opt-in with --llm-cache)."""
+    CACHE_DIR: str = os.getenv("LLM_CACHE_DIR", ".cache/llm_responses")
+    TTL_SECONDS: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))  # Entries older than this are ignored and removed
+    MAX_SIZE_BYTES: int = int(os.getenv("LLM_CACHE_MAX_SIZE_BYTES", str(200 * 1024 * 1024)))  # Least recently used entries are evicted above this size
+
+@dataclass(frozen=True)
+class QualityTier:
+    """Generation and encoding settings applied together for one quality level."""
+    name: str
+    image_quality: str  # gpt-image-1 quality (low, medium, high)
+    image_size: str  # gpt-image-1 size
+    tts_model: str
+    x264_preset: str
+    fps: int
+    video_size: tuple  # Max canvas (width, height)
+
+# Tiers ordered from highest to lowest quality. "standard" matches the per-agent defaults above.
+QUALITY_TIERS = {
+    "premium": QualityTier(
+        name="premium",
+        image_quality="high",
+        image_size=ImageProducerConfig.IMAGE_SIZE,
+        tts_model=DubbingArtistConfig.OPENAI_MODEL,
+        x264_preset="slow",
+        fps=30,
+        video_size=VideoBuilderConfig.VIDEO_SIZE,
+    ),
+    "standard": QualityTier(
+        name="standard",
+        image_quality=ImageProducerConfig.IMAGE_QUALITY,
+        image_size=ImageProducerConfig.IMAGE_SIZE,
+        tts_model=DubbingArtistConfig.OPENAI_MODEL,
+        x264_preset=VideoBuilderConfig.X264_PRESET,
+        fps=VideoBuilderConfig.FPS,
+        video_size=VideoBuilderConfig.VIDEO_SIZE,
+    ),
+    "draft": QualityTier(
+        name="draft",
+        image_quality="low",
+        image_size=ImageProducerConfig.IMAGE_SIZE,
+        tts_model="tts-1",  # Faster, but ignores voice instructions
+        x264_preset="veryfast",
+        fps=15,
+        video_size=(512, 768),
+    ),
+}
+
+class QualityConfig(AgentConfig):
+    """Configuration for quality tier selection and the load-adaptive policy."""
+    DEFAULT_TIER: str = os.getenv("QUALITY_TIER", "standard")
+    # Step down one tier for every QUEUE_DEPTH_PER_STEP jobs waiting in the queue
+    QUEUE_DEPTH_PER_STEP: int = int(os.getenv("QUALITY_QUEUE_DEPTH_PER_STEP", "10"))
+    # Step down one tier when the median of a stage's recent latencies exceeds its budget (seconds)
+    STAGE_LATENCY_BUDGETS: dict = {
+        "script_writer_agent": 60,
+        "image_producer_agent": 180,
+        "dubbing_agent": 60,
+        "bgscore_agent": 240,
+        "video_builder_agent": 180,
+    }
+    LATENCY_WINDOW: int = 5  # Number of recent runs per stage considered
+    LATENCY_LOG_FILE: str = "output/stage_latencies.jsonl"
+    JOB_LOG_FILE: str = "output/quality_tiers.jsonl"  # Tier used for each output
+    JOB_SIDECAR_FILE: str = "final_video.json"  # Written next to final_video.mp4 with the job's tier
 
 # @dataclass
 # class SocialMediaPublisherConfig(AgentConfig):
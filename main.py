@@ -1,17 +1,23 @@
 import asyncio 
 import argparse
-from agents.director_agent import director_agent 
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory import InMemoryMemoryService
-from google.adk.runners import Runner
-from google.genai import types
+import time
+import uuid
+from agents.quality import AdaptiveTierPolicy, record_job_tier, record_stage_latencies, set_quality_tier, stage_name
 from dotenv import load_dotenv
+from config.config import QUALITY_TIERS, QualityConfig, VideoBuilderConfig
+
+# The agents and ADK are imported where they are used: the parallel renderer's spawned
+# workers re-import this module, and building every agent there costs seconds per worker
 
 load_dotenv()  # Load environment variables from .env file
 
 async def call_agent_async(query: str, runner, user_id, session_id):
-  """Sends a query to the agent and prints the final response."""
+  """Sends a query to the agent and prints the final response.
+  Returns the time each stage emitted its last event, in order of first appearance."""
+  from google.genai import types
+
   print(f"\n>>> User Query: {query}")
+  stage_finished_at = {}
 
   # Prepare the user's message in ADK format
   content = types.Content(role='user', parts=[types.Part(text=query)])
@@ -21,6 +27,7 @@ async def call_agent_async(query: str, runner, user_id, session_id):
   async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=content):
     # You can uncomment the line below to see *all* events during execution
     print(f"[Event] Author: {event.author}, Type: {type(event).__name__}, Final: {event.is_final_response()}, Content: {event.content}")
+    stage_finished_at[stage_name(event.author)] = time.time()
 
 # --- Check for specific parts FIRST ---
     has_specific_part = False
@@ -45,33 +52,74 @@ async def call_agent_async(query: str, runner, user_id, session_id):
             print(f"Agent escalated: {event.error_message or 'No specific message.'}")
         # Add more checks here if needed (e.g., specific error codes)
         #break # Stop processing events once the final response is found
+  return stage_finished_at
         
 
-async def run_team_conversation(input_prompt:str):
+async def run_team_conversation(input_prompt:str, fast_path:bool=False, use_llm_cache:bool=False, speculative_bgscore:bool=False,
+                                quality:str=QualityConfig.DEFAULT_TIER, adaptive_quality:bool=False, queue_depth:int=0):
+    from agents.director_agent import director_agent, fast_path_director_agent, create_director_agent
+    from agents.speculative_bgscore import SpeculativeScore
+    from agents.llm_cache import LLMResponseCache, install_llm_cache
+    from google.adk.sessions import InMemorySessionService
+    from google.adk.memory import InMemoryMemoryService
+    from google.adk.runners import Runner
+
     print("\n--- Starting Agent Team Delegation ---")
+    job_id = uuid.uuid4().hex
+    # Pick the quality tier for this job; tools read it from the job's context
+    tier, tier_reason = quality, "requested"
+    if adaptive_quality:
+        tier, tier_reason = AdaptiveTierPolicy().choose(quality, queue_depth=queue_depth)
+    set_quality_tier(tier)
+    print(f"Quality tier: {tier} ({tier_reason})")
+    speculation = None
+    if speculative_bgscore:
+        # Start composing from the prompt's mood while the script is being written
+        speculation = SpeculativeScore(input_prompt)
+        speculation.start()
     session_service = InMemorySessionService()
     memory_service = InMemoryMemoryService()
     APP_NAME = "video_generation_agent_team"
     USER_ID = "user_1_agent_team"
-    SESSION_ID = "session_001_agent_team"
+    SESSION_ID = job_id  # One session per job, so the job log can be matched to its run
     session = session_service.create_session(
         app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID
     )
     print(f"Session created: App='{APP_NAME}', User='{USER_ID}', Session='{SESSION_ID}'")
 
+    if speculation is not None:
+        root_agent = create_director_agent(fast_path=fast_path, speculation=speculation)
+    else:
+        root_agent = fast_path_director_agent if fast_path else director_agent
+    llm_cache = None
+    if use_llm_cache:
+        llm_cache = LLMResponseCache()
+        install_llm_cache(root_agent, llm_cache)
+        print(f"LLM response cache enabled at '{llm_cache.cache_dir}'.")
     runner_agent_team = Runner( # Or use InMemoryRunner
-        agent=director_agent,
+        agent=root_agent,
         app_name=APP_NAME,
         session_service=session_service,
         memory_service=memory_service,
     )
-    print(f"Runner created for agent '{director_agent.name}'.")
+    print(f"Runner created for agent '{root_agent.name}'.")
 
     # --- Interactions using await (correct within async def) ---
-    await call_agent_async(query = input_prompt,
+    started_at = time.time()
+    stage_finished_at = await call_agent_async(query = input_prompt,
                             runner=runner_agent_team,
                             user_id=USER_ID,
                             session_id=SESSION_ID)
+    # Each stage runs from the end of the previous one to its own last event
+    stage_latencies = {}
+    previous = started_at
+    for stage, finished_at in stage_finished_at.items():
+        stage_latencies[stage] = finished_at - previous
+        previous = finished_at
+    record_stage_latencies(stage_latencies, tier)
+    record_job_tier(job_id, quality, tier, tier_reason, output_folder=VideoBuilderConfig.output_dir)
+    if llm_cache:
+        print(f"LLM cache: {llm_cache.hits} hits, {llm_cache.misses} misses")
 
 def parse_args():
     """Parse command line arguments."""
@@ -82,6 +130,67 @@ def parse_args():
         default="",
         help="Prompt to generate a video. (e.g., 'Either we win or we learn. we never fail.')"
     )
+    parser.add_argument(
+        "--fast-path",
+        action="store_true",
+        help="Only use an LLM for the script; call the image, dubbing, music and video tools directly."
+    )
+    parser.add_argument(
+        "--llm-cache",
+        action="store_true",
+        help="Reuse cached LLM responses (including tool calls) for identical requests."
+    )
+    parser.add_argument(
+        "--speculative-bgscore",
+        action="store_true",
+        help="Start composing background music from the prompt while the script is written."
+    )
+    parser.add_argument(
+        "--quality",
+        choices=list(QUALITY_TIERS),
+        default=QualityConfig.DEFAULT_TIER,
+        help="Quality tier for image generation, narration and encoding."
+    )
+    parser.add_argument(
+        "--adaptive-quality",
+        action="store_true",
+        help="Step down from --quality when the queue is deep or recent stages were slow."
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        default=0,
+        help="Number of jobs waiting behind this one, used by --adaptive-quality."
+    )
+    parser.add_argument(
+        "--mp4-layout",
+        choices=["standard", "faststart", "fragmented"],
+        default=VideoBuilderConfig.MP4_LAYOUT,
+        help="MP4 layout. 'faststart' and 'fragmented' let players start before the download ends."
+    )
+    parser.add_argument(
+        "--hls",
+        action="store_true",
+        default=VideoBuilderConfig.HLS_ENABLED,
+        help="Also package the video as HLS (output/hls/master.m3u8)."
+    )
+    parser.add_argument(
+        "--hls-renditions",
+        default=VideoBuilderConfig.HLS_RENDITIONS,
+        help="Extra lower HLS renditions as height:video bitrate pairs, e.g. '720:2500k,480:1000k'."
+    )
+    parser.add_argument(
+        "--poster",
+        action="store_true",
+        default=VideoBuilderConfig.POSTER_ENABLED,
+        help="Also write a poster thumbnail (output/poster.jpg)."
+    )
+    parser.add_argument(
+        "--render-mode",
+        choices=["compose", "streaming", "parallel"],
+        default=VideoBuilderConfig.RENDER_MODE,
+        help="Video renderer. 'streaming' keeps memory flat for long videos, 'parallel' renders chunks on all cores."
+    )
     return parser.parse_args()
 
 def main():
@@ -96,7 +205,16 @@ def main():
     try:
         # This creates an event loop, runs your async function, and closes the loop.
         input_prompt = args.prompt
-        asyncio.run(run_team_conversation(args.prompt))
+        VideoBuilderConfig.RENDER_MODE = args.render_mode
+        VideoBuilderConfig.MP4_LAYOUT = args.mp4_layout
+        VideoBuilderConfig.HLS_ENABLED = args.hls
+        VideoBuilderConfig.HLS_RENDITIONS = args.hls_renditions
+        from agents.stream_packager import parse_renditions
+        parse_renditions(args.hls_renditions)  # Reject a malformed value before the video is generated
+        VideoBuilderConfig.POSTER_ENABLED = args.poster
+        asyncio.run(run_team_conversation(args.prompt, fast_path=args.fast_path, use_llm_cache=args.llm_cache,
+                                          speculative_bgscore=args.speculative_bgscore, quality=args.quality,
+                                          adaptive_quality=args.adaptive_quality, queue_depth=args.queue_depth))
     except Exception as e:
         print(f"An error occurred: {e}")
 
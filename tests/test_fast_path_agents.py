@@ -0,0 +1,75 @@
+import asyncio
+import wave
+from types import SimpleNamespace
+
+from google.adk.events import Event
+from google.genai import types
+
+from agents import fast_path_agents
+from agents.dubbing_agent import create_dubbing_agent
+from agents.fast_path_agents import DubbingFastAgent, music_prompt, read_video_script
+from agents.script_parser import ScriptSegment
+
+SCRIPT = "(0-5)\nNarrator: \"Hello\"\nVisual: Sunrise over hills\nBackground Music: Soft piano.\n"
+
+
+def save_call(invocation_id, script):
+    call = types.FunctionCall(name="save_script_to_file", args={"script": script, "file_name": "output/video_script.txt"})
+    return Event(
+        author="script_writer_agent",
+        invocation_id=invocation_id,
+        content=types.Content(role="model", parts=[types.Part(function_call=call)]),
+    )
+
+
+def context(events=(), reply=""):
+    session = SimpleNamespace(events=list(events), state={"video_script": reply})
+    return SimpleNamespace(session=session, invocation_id="job2")
+
+
+def test_read_video_script_prefers_the_reply_when_it_is_the_script():
+    assert read_video_script(context(reply=SCRIPT)) == SCRIPT
+
+
+def test_read_video_script_reads_the_script_saved_in_this_invocation():
+    ctx = context([save_call("job2", SCRIPT)], reply="Saved the script with Visual cues.")
+
+    assert read_video_script(ctx) == SCRIPT
+
+
+def test_read_video_script_ignores_scripts_saved_by_earlier_jobs():
+    reply = "Saved the script with Visual cues."
+
+    assert read_video_script(context([save_call("job1", SCRIPT)], reply=reply)) == reply
+
+
+def test_music_prompt_strips_trailing_punctuation_from_cues():
+    segments = [
+        ScriptSegment(start=0, end=5, visual="A", background_music="Triumphant strings."),
+        ScriptSegment(start=5, end=10, visual="B", background_music="Triumphant strings."),
+    ]
+
+    assert music_prompt(segments) == "Triumphant strings. 10 seconds long."
+
+
+def test_music_prompt_defaults_without_cues():
+    segments = [ScriptSegment(start=0, end=8, visual="A")]
+
+    assert music_prompt(segments) == f"{fast_path_agents.DEFAULT_MUSIC_CUE}. 8 seconds long."
+
+
+def test_dubbing_writes_silence_for_scripts_without_narration(tmp_path, monkeypatch):
+    dubbing_file = tmp_path / "dubbing.mp3"
+    monkeypatch.setattr(fast_path_agents, "DUBBING_FILE", str(dubbing_file))
+    agent = DubbingFastAgent(
+        name="dubbing_agent",
+        description="",
+        fallback_agent=create_dubbing_agent("dubbing_agent_llm"),
+        output_key="dubbing_file",
+    )
+
+    result = asyncio.run(agent.run_stage([ScriptSegment(start=0, end=3, visual="Sunrise")]))
+
+    assert result["status"] == "success"
+    with wave.open(str(dubbing_file)) as f:
+        assert f.getnframes() / f.getframerate() == 3
@@ -0,0 +1,91 @@
+import json
+import os
+import time
+
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from agents.llm_cache import LLMResponseCache, request_cache_key
+
+
+def function_call(call_id):
+    return types.Part(function_call=types.FunctionCall(id=call_id, name="generate_tts", args={"text": "Hi"}))
+
+
+def function_response(call_id):
+    return types.Part(
+        function_response=types.FunctionResponse(id=call_id, name="generate_tts", response={"status": "success"})
+    )
+
+
+def request(call_id):
+    return LlmRequest(
+        model="gemini",
+        contents=[
+            types.Content(role="user", parts=[types.Part(text="Narrate")]),
+            types.Content(role="model", parts=[function_call(call_id)]),
+            types.Content(role="user", parts=[function_response(call_id)]),
+        ],
+    )
+
+
+def response(text="done"):
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]))
+
+
+def test_keys_are_stable_across_function_call_ids():
+    assert request_cache_key(request("adk-1")) == request_cache_key(request("adk-2"))
+    assert request_cache_key(request("adk-1")) != request_cache_key(LlmRequest(model="gemini"))
+
+
+def test_expired_entry_is_a_miss_and_removed(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), ttl_seconds=60)
+    cache.put("key", "gemini", response())
+    path = tmp_path / "key.json"
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    assert cache.get("key") is None
+    assert not path.exists()
+
+
+def test_get_keeps_creation_time_for_ttl(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path), ttl_seconds=60)
+    cache.put("key", "gemini", response())
+    path = tmp_path / "key.json"
+    created = time.time() - 30
+    os.utime(path, (created, created))
+
+    assert cache.get("key") is not None
+    assert path.stat().st_mtime == created
+    assert path.stat().st_atime > created
+
+
+def test_eviction_keeps_most_recently_read_entry(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path))
+    for key in ("a", "b", "c"):
+        cache.put(key, "gemini", response())
+    now = time.time()
+    for key, age in (("a", 300), ("b", 200), ("c", 100)):
+        path = tmp_path / f"{key}.json"
+        os.utime(path, (now - age, path.stat().st_mtime))
+    cache.get("a")
+
+    cache.max_size_bytes = (tmp_path / "a.json").stat().st_size + (tmp_path / "c.json").stat().st_size
+    cache.evict()
+
+    assert sorted(p.stem for p in tmp_path.glob("*.json")) == ["a", "c"]
+
+
+def test_put_round_trips_function_calls(tmp_path):
+    cache = LLMResponseCache(cache_dir=str(tmp_path))
+    llm_response = LlmResponse(content=types.Content(role="model", parts=[function_call("adk-1")]))
+
+    cache.put("key", "gemini", llm_response)
+    entry = cache.get("key")
+    replayed = LlmResponse.model_validate(entry["response"])
+
+    assert entry["tool_calls"] == [{"name": "generate_tts", "args": {"text": "Hi"}}]
+    call = replayed.content.parts[0].function_call
+    assert (call.name, call.args, call.id) == ("generate_tts", {"text": "Hi"}, None)
+    assert json.loads((tmp_path / "key.json").read_text())["model"] == "gemini"
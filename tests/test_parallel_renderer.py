@@ -0,0 +1,50 @@
+import pytest
+
+from agents.parallel_renderer import plan_chunks
+
+
+def segments(*durations):
+    return [(f"{i}.png", duration) for i, duration in enumerate(durations)]
+
+
+def names(chunk):
+    return [path for path, _ in chunk[0]]
+
+
+def test_plan_chunks_splits_evenly_at_segment_boundaries():
+    chunks = plan_chunks(segments(2, 2, 2, 2), video_duration=8, workers=2)
+
+    assert [names(c) for c in chunks] == [["0.png", "1.png"], ["2.png", "3.png"]]
+    assert [d for _, d in chunks] == [4, 4]
+
+
+def test_plan_chunks_cuts_at_first_boundary_past_each_split_point():
+    chunks = plan_chunks(segments(3, 5, 3, 7, 3, 5), video_duration=26, workers=3)
+
+    assert [d for _, d in chunks] == [11, 7, 8]
+    assert [len(c[0]) for c in chunks] == [3, 1, 2]
+
+
+def test_plan_chunks_trims_segments_past_the_video_duration():
+    chunks = plan_chunks(segments(2, 2, 2, 2), video_duration=5, workers=1)
+
+    assert chunks == [([("0.png", 2), ("1.png", 2), ("2.png", 1)], 5)]
+
+
+def test_plan_chunks_pads_the_last_chunk_with_black():
+    chunks = plan_chunks(segments(2, 2, 2), video_duration=10, workers=2)
+
+    assert [d for _, d in chunks] == [4, 6]
+    assert names(chunks[-1]) == ["2.png"]
+
+
+@pytest.mark.parametrize("workers", [3, 8])
+def test_plan_chunks_with_more_workers_than_segments(workers):
+    chunks = plan_chunks(segments(4, 4), video_duration=8, workers=workers)
+
+    assert [names(c) for c in chunks] == [["0.png"], ["1.png"]]
+    assert sum(d for _, d in chunks) == 8
+
+
+def test_plan_chunks_without_segments_renders_one_black_chunk():
+    assert plan_chunks([], video_duration=3, workers=4) == [([], 3)]
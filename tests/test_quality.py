@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from agents.quality import AdaptiveTierPolicy, record_job_tier, record_stage_latencies, stage_name
+from config.config import QualityConfig
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(QualityConfig, "LATENCY_LOG_FILE", str(tmp_path / "stage_latencies.jsonl"))
+    monkeypatch.setattr(QualityConfig, "JOB_LOG_FILE", str(tmp_path / "quality_tiers.jsonl"))
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "author, stage",
+    [
+        ("image_producer_agent", "image_producer_agent"),
+        ("image_producer_agent_llm", "image_producer_agent"),
+        ("speculative_bgscore_agent", "bgscore_agent"),
+        ("bgscore_agent_llm", "bgscore_agent"),
+    ],
+)
+def test_stage_name_maps_authors_to_budgeted_stages(author, stage):
+    assert stage_name(author) == stage
+    assert stage in QualityConfig.STAGE_LATENCY_BUDGETS
+
+
+def test_policy_keeps_requested_tier_without_load(logs):
+    assert AdaptiveTierPolicy(queue_depth_per_step=10).choose("premium", queue_depth=3) == ("premium", "requested")
+
+
+def test_policy_steps_down_per_queue_depth_step(logs):
+    tier, reason = AdaptiveTierPolicy(queue_depth_per_step=10).choose("premium", queue_depth=25)
+
+    assert tier == "draft"
+    assert "queue depth 25" in reason
+
+
+def test_policy_steps_down_for_slow_stages(logs):
+    record_stage_latencies({stage_name("bgscore_agent_llm"): 1000}, "standard")
+
+    tier, reason = AdaptiveTierPolicy(stage_latency_budgets={"bgscore_agent": 240}).choose("standard")
+
+    assert tier == "draft"
+    assert "bgscore_agent" in reason
+
+
+def test_record_job_tier_writes_sidecar_next_to_output(logs):
+    record_job_tier("job1", "premium", "standard", "stepped down", output_folder=str(logs / "output"))
+
+    with open(logs / "output" / QualityConfig.JOB_SIDECAR_FILE) as f:
+        assert json.load(f)["tier"] == "standard"
+    with open(QualityConfig.JOB_LOG_FILE) as f:
+        assert json.loads(f.readline())["job_id"] == "job1"
@@ -0,0 +1,80 @@
+import pytest
+
+from agents.script_parser import ScriptParseError, ScriptSegment, parse_video_script, segment_file_stem
+
+SCRIPT = """Here is your script:
+
+```
+**(0-5)**
+**Narrator:** "Every champion was once a beginner."
+**Visual:** Young basketball player misses a shot.
+**Background Music:** Soft, hopeful piano.
+```
+
+```
+**(5-12 seconds)**
+**Visual:** Player practices at dawn
+**Background Music:** Building strings
+```
+"""
+
+
+def test_parse_video_script_reads_fenced_blocks():
+    segments = parse_video_script(SCRIPT)
+
+    assert segments == [
+        ScriptSegment(
+            start=0,
+            end=5,
+            visual="Young basketball player misses a shot.",
+            narrator="Every champion was once a beginner.",
+            background_music="Soft, hopeful piano.",
+        ),
+        ScriptSegment(start=5, end=12, visual="Player practices at dawn", background_music="Building strings"),
+    ]
+    assert segments[1].duration == 7
+
+
+def test_parse_video_script_narrator_is_optional():
+    segments = parse_video_script("(0-3)\nVisual: Sunrise over hills\n")
+
+    assert segments[0].narrator == ""
+
+
+def test_parse_video_script_accepts_optional_marker_on_narrator():
+    segments = parse_video_script('(0-3)\n[Optional] Narrator: "Hello"\nVisual: Sunrise\n')
+
+    assert segments[0].narrator == "Hello"
+
+
+def test_parse_video_script_orders_segments_by_start():
+    segments = parse_video_script("(4-8)\nVisual: B\n(0-4)\nVisual: A\n")
+
+    assert [s.visual for s in segments] == ["A", "B"]
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        "",
+        "A script without any timing blocks.\nVisual: Sunrise",
+        "(0-5)\nNarrator: \"No visual here\"\n",
+        "(5-3)\nVisual: Backwards timing\n",
+        "(4-4)\nVisual: Empty segment\n",
+    ],
+    ids=["empty", "no-timing", "missing-visual", "end-before-start", "zero-length"],
+)
+def test_parse_video_script_rejects_invalid_scripts(script):
+    with pytest.raises(ScriptParseError):
+        parse_video_script(script)
+
+
+def test_segment_file_stem_uses_timing_and_first_words():
+    segment = ScriptSegment(start=20, end=27, visual="Basketball player scores, crowd cheers!")
+
+    assert segment_file_stem(segment) == "20_27_basketball_player_scores_crowd"
+    assert segment_file_stem(segment, max_words=2) == "20_27_basketball_player"
+
+
+def test_segment_file_stem_falls_back_when_visual_has_no_words():
+    assert segment_file_stem(ScriptSegment(start=0, end=3, visual="!!!")) == "0_3_scene"
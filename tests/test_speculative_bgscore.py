@@ -0,0 +1,116 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from agents import speculative_bgscore
+from agents.bgscore_agent import create_bgscore_agent
+from agents.speculative_bgscore import (
+    SpeculativeBackgroundScoreAgent,
+    SpeculativeScore,
+    infer_moods,
+    mood_similarity,
+    speculative_music_prompt,
+)
+from config.config import BackgroundScoreConfig
+
+
+@pytest.mark.parametrize(
+    "text, moods",
+    [
+        ("An inspiring story about winning", {"uplifting"}),
+        ("Soft, gentle piano", {"calm"}),
+        ("Upbeat and energetic sports montage", {"energetic"}),
+        ("A sad, melancholic farewell", {"sad"}),
+        ("Epic orchestral build with tension", {"dramatic"}),
+        ("Fun and playful", {"happy"}),
+    ],
+)
+def test_infer_moods_matches_words_and_stems(text, moods):
+    assert infer_moods(text) == moods
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "A funeral procession",
+        "Looking out of the window in winter",
+        "Explain how software is built",
+        "A horse saddle",
+        "A hopeless situation at the powerless station",
+    ],
+)
+def test_infer_moods_ignores_words_sharing_a_short_prefix(text):
+    assert infer_moods(text) & {"happy", "uplifting", "calm", "energetic"} == set()
+
+
+def test_hopeless_is_sad_not_uplifting():
+    assert infer_moods("hopeless") == {"sad"}
+
+
+def test_mood_similarity():
+    assert mood_similarity(set(), set()) == 1.0
+    assert mood_similarity({"calm"}, {"calm", "sad"}) == 0.5
+    assert mood_similarity({"calm"}, {"happy"}) == 0.0
+
+
+def test_speculative_music_prompt_requests_a_length():
+    assert speculative_music_prompt("Inspiring quotes") == "Uplifting background music. 30 seconds long."
+    assert speculative_music_prompt("Explain software").endswith(". 30 seconds long.")
+
+
+def run_agent(agent, ctx):
+    async def first_event():
+        # The composition task has to be created inside the running loop
+        agent.speculation.task = asyncio.ensure_future(agent.speculation.task)
+        events = agent._run_async_impl(ctx)
+        event = await events.__anext__()
+        await events.aclose()
+        return event
+
+    return asyncio.run(first_event())
+
+
+@pytest.fixture
+def speculative_agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(BackgroundScoreConfig, "SPECULATION_STATS_FILE", str(tmp_path / "stats.json"))
+    monkeypatch.setattr(speculative_bgscore, "SPECULATIVE_MUSIC_FILE", str(tmp_path / "speculative.mp3"))
+    monkeypatch.setattr(speculative_bgscore, "BACKGROUND_MUSIC_FILE", str(tmp_path / "background_music.mp3"))
+    monkeypatch.setattr(speculative_bgscore, "track_duration", lambda _: 30.0)
+
+    def create(user_prompt):
+        (tmp_path / "speculative.mp3").write_bytes(b"track")
+        speculation = SpeculativeScore(user_prompt)
+        speculation.started_at = speculation.finished_at = time.monotonic()
+
+        async def composed():
+            return {"status": "success", "file": str(tmp_path / "speculative.mp3")}
+
+        speculation.task = composed()
+        return SpeculativeBackgroundScoreAgent(speculation, create_bgscore_agent("bgscore_agent_llm"))
+
+    return create
+
+
+def script_context(script):
+    session = SimpleNamespace(events=[], state={"video_script": script})
+    return SimpleNamespace(session=session, invocation_id="job", branch=None)
+
+
+@pytest.mark.parametrize(
+    "cue, hit",
+    [("Inspiring, hopeful strings", True), ("Dark, ominous drones", False)],
+)
+def test_event_text_has_no_per_run_metrics(speculative_agent, cue, hit):
+    ctx = script_context(f"(0-10)\nVisual: Sunrise\nBackground Music: {cue}\n")
+
+    texts = []
+    for _ in range(2):
+        event = run_agent(speculative_agent("An inspiring story"), ctx)
+        report = event.actions.state_delta["bgscore_speculation"]
+        assert report["hit"] is hit
+        texts.append(event.content.parts[0].text)
+
+    assert texts[0] == texts[1]
+    assert "hit_rate" not in texts[0] and "time_saved" not in texts[0]
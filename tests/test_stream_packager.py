@@ -0,0 +1,91 @@
+import pytest
+
+from agents.stream_packager import (
+    keyframe_params,
+    mp4_params,
+    parse_renditions,
+    playlist_bandwidth,
+    stream_codecs,
+)
+
+
+def test_mp4_params():
+    assert mp4_params("standard") == []
+    assert mp4_params("faststart") == ["-movflags", "+faststart"]
+    with pytest.raises(ValueError):
+        mp4_params("webm")
+
+
+@pytest.mark.parametrize(
+    "start, expression",
+    [
+        (0, "expr:gte(t,0+n_forced*4)"),
+        (8, "expr:gte(t,0+n_forced*4)"),
+        (11, "expr:gte(t,1+n_forced*4)"),
+        (2.5, "expr:gte(t,1.5+n_forced*4)"),
+    ],
+)
+def test_keyframe_params_stay_on_the_video_grid(start, expression):
+    assert keyframe_params(4, start) == ["-force_key_frames", expression]
+
+
+def test_playlist_bandwidth_reports_peak_and_average(tmp_path):
+    (tmp_path / "s_000.ts").write_bytes(b"\0" * 1000)
+    (tmp_path / "s_001.ts").write_bytes(b"\0" * 4000)
+    (tmp_path / "s_002.ts").write_bytes(b"\0" * 500)
+    playlist = tmp_path / "s.m3u8"
+    playlist.write_text(
+        "#EXTM3U\n#EXT-X-TARGETDURATION:4\n"
+        "#EXTINF:4.000000,\ns_000.ts\n"
+        "#EXTINF:4.000000,\ns_001.ts\n"
+        "#EXTINF:2.000000,\ns_002.ts\n"
+        "#EXT-X-ENDLIST\n"
+    )
+
+    assert playlist_bandwidth(str(playlist)) == (8000, 4400)
+
+
+def ts_packet(pid, payload):
+    return (bytes([0x47, 0x40 | pid >> 8, pid & 0xFF, 0x10]) + payload).ljust(188, b"\xff")
+
+
+def ts_segment(streams):
+    """A minimal MPEG-TS segment: PAT, PMT and one PES packet per (stream type, PID, payload)."""
+    pat = bytes([0, 0x00, 0xB0, 13, 0, 1, 0xC1, 0, 0, 0, 1, 0xF0, 0x00]) + b"\0" * 4
+    entries = b"".join(bytes([kind, 0xE0 | pid >> 8, pid & 0xFF, 0xF0, 0]) for kind, pid, _ in streams)
+    pmt = bytes([0, 0x02, 0xB0, 13 + len(entries), 0, 1, 0xC1, 0, 0, 0xE1, 0x00, 0xF0, 0]) + entries + b"\0" * 4
+    pes = [
+        ts_packet(pid, b"\0\0\x01\xe0\0\0\x80\x80\x05" + b"\x21\0\x01\0\x01" + payload)
+        for _, pid, payload in streams
+    ]
+    return ts_packet(0, pat) + ts_packet(0x1000, pmt) + b"".join(pes)
+
+
+H264 = (0x1B, 0x100, b"\0\0\0\x01\x09\xf0" + b"\0\0\0\x01\x67\x64\x00\x1f\xac")
+AAC_LC = (0x0F, 0x101, b"\xff\xf1\x50\x80")
+
+
+@pytest.mark.parametrize(
+    "streams, codecs",
+    [([H264, AAC_LC], "avc1.64001F,mp4a.40.2"), ([AAC_LC, H264], "avc1.64001F,mp4a.40.2"), ([H264], "avc1.64001F")],
+)
+def test_stream_codecs_reads_the_encoded_streams(tmp_path, streams, codecs):
+    segment = tmp_path / "s_000.ts"
+    segment.write_bytes(ts_segment(streams))
+
+    assert stream_codecs(str(segment)) == codecs
+
+
+def test_stream_codecs_requires_h264(tmp_path):
+    segment = tmp_path / "s_000.ts"
+    segment.write_bytes(ts_segment([AAC_LC]))
+
+    with pytest.raises(ValueError):
+        stream_codecs(str(segment))
+
+
+def test_parse_renditions():
+    assert parse_renditions("") == ()
+    assert parse_renditions("720:2500k, 480:1000k") == ((720, "2500k"), (480, "1000k"))
+    with pytest.raises(ValueError):
+        parse_renditions("720")
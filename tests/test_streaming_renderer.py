@@ -0,0 +1,39 @@
+from PIL import Image
+
+from agents.streaming_renderer import SegmentFrameSource, canvas_size, fit_size
+
+
+def make_segments(tmp_path, count, size=(8, 12), duration=2):
+    segments = []
+    for i in range(count):
+        path = tmp_path / f"{i * duration}_{(i + 1) * duration}_scene.png"
+        Image.new("RGB", size, (i * 10 % 256, 0, 0)).save(path)
+        segments.append((str(path), duration))
+    return segments
+
+
+def test_frame_source_caches_only_current_and_next_image(tmp_path):
+    source = SegmentFrameSource(make_segments(tmp_path, 5), transition=0)
+
+    for t in range(10):
+        source(t)
+        index = t // 2
+        assert set(source._cache) <= {index, index + 1}
+
+
+def test_frame_source_fades_in_and_pads_with_black(tmp_path):
+    source = SegmentFrameSource(make_segments(tmp_path, 2), transition=1.0)
+
+    assert source(2.0).max() == 0
+    assert source(2.5)[0, 0, 0] == 5
+    assert source(3.5)[0, 0, 0] == 10
+    assert source(4.0).max() == 0
+
+
+def test_canvas_and_fit_size_are_even(tmp_path):
+    segments = make_segments(tmp_path, 1, size=(7, 11))
+
+    assert canvas_size([path for path, _ in segments]) == (8, 12)
+    assert fit_size((1024, 1536), (512, 768)) == (512, 768)
+    assert fit_size((1000, 1000), (511, 2000)) == (510, 510)
+    assert fit_size((100, 100), None) == (100, 100)